@@ -1,9 +1,43 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import numpy as np
 from datetime import datetime, timedelta
 import random
+import os
+import re
+import sys
+import heapq
+import itertools
+import threading
+import time
+import glob
+import logging
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+try:
+    import duckdb
+except ImportError:  # Optional query engine backend
+    duckdb = None
+
+# Optional query engine: point these at Parquet claim files (globs allowed) to run
+# page aggregations in DuckDB instead of pandas
+CLAIMS_PARQUET = os.environ.get("RAPIDCLAIMS_CLAIMS_PARQUET")
+DENIALS_PARQUET = os.environ.get("RAPIDCLAIMS_DENIALS_PARQUET")
+QUERY_THREADS = int(os.environ.get("RAPIDCLAIMS_QUERY_THREADS", os.cpu_count() or 1))
+TRACKER_ROW_LIMIT = 1000
+QUERY_CACHE_ENTRIES = 512
+
+# Background refresh of the claim store and page aggregates
+REFRESH_INTERVAL_SECONDS = int(os.environ.get("RAPIDCLAIMS_REFRESH_SECONDS", 900))
+REFRESH_POLL_SECONDS = int(os.environ.get("RAPIDCLAIMS_REFRESH_POLL_SECONDS", 30))
+
+# Bounded pool that runs shared page computations
+COMPUTE_WORKERS = int(os.environ.get("RAPIDCLAIMS_COMPUTE_WORKERS", min(8, os.cpu_count() or 1)))
 
 # Page configuration
 st.set_page_config(
@@ -73,37 +107,41 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Sample data generation
-@st.cache_data
-def generate_sample_data():
-    np.random.seed(42)
-    random.seed(42)
+def generate_sample_data(seed=42):
+    rng = random.Random(seed)
+    np_rng = np.random.RandomState(seed)
     
     payers = ['Medicare', 'Medicaid', 'Blue Cross', 'Aetna', 'UnitedHealth', 'Humana', 'Cigna']
     departments = ['Cardiology', 'Orthopedics', 'Emergency', 'Surgery', 'Radiology', 'Laboratory', 'ICU']
     
     # Generate claims data
+    today = pd.Timestamp.today().normalize()
     claims_data = []
     for i in range(200):
         claim_id = f"CLM{1000 + i}"
-        payer = random.choice(payers)
-        department = random.choice(departments)
-        amount_raised = round(random.uniform(500, 25000), 2)
+        payer = rng.choice(payers)
+        department = rng.choice(departments)
+        amount_raised = round(rng.uniform(500, 25000), 2)
         # Simulate some claims with partial payments
-        payment_rate = random.uniform(0.7, 1.0)
+        payment_rate = rng.uniform(0.7, 1.0)
         amount_received = round(amount_raised * payment_rate, 2)
         
         # Days to resolution (for pie chart)
-        resolution_days = random.choice([
-            random.randint(1, 30),   # 0-30 days
-            random.randint(31, 60),  # 31-60 days
-            random.randint(61, 90),  # 61-90 days
-            random.randint(91, 120), # 91-120 days
-            random.randint(121, 365) # 120+ days
+        resolution_days = rng.choice([
+            rng.randint(1, 30),   # 0-30 days
+            rng.randint(31, 60),  # 31-60 days
+            rng.randint(61, 90),  # 61-90 days
+            rng.randint(91, 120), # 91-120 days
+            rng.randint(121, 365) # 120+ days
         ])
         
         # Outstanding amount (amount not yet received)
         outstanding_amount = amount_raised - amount_received
         
+        # Submission date over the past 6 months and whether the first submission was denied
+        submission_date = today - timedelta(days=int(np_rng.randint(0, 180)))
+        denied = bool(np_rng.random_sample() < 0.15)
+        
         claims_data.append({
             'Claim ID': claim_id,
             'Payer': payer,
@@ -111,15 +149,15 @@ def generate_sample_data():
             'Amount Raised': amount_raised,
             'Amount Received': amount_received,
             'Outstanding Amount': outstanding_amount,
-            'Resolution Days': resolution_days
+            'Resolution Days': resolution_days,
+            'Submission Date': submission_date,
+            'Denied': denied
         })
     
     return pd.DataFrame(claims_data)
 
-@st.cache_data
-def generate_denial_data():
-    np.random.seed(42)
-    random.seed(42)
+def generate_denial_data(seed=42):
+    rng = random.Random(seed)
     
     payers = ['Medicare', 'Medicaid', 'Blue Cross', 'Aetna', 'UnitedHealth', 'Humana', 'Cigna']
     departments = ['Cardiology', 'Orthopedics', 'Emergency', 'Surgery', 'Radiology', 'Laboratory', 'ICU']
@@ -142,9 +180,9 @@ def generate_denial_data():
     denial_data = []
     for i in range(150):  # 150 denied claims
         claim_id = f"CLM{2000 + i}"
-        payer = random.choice(payers)
-        department = random.choice(departments)
-        reason_idx = random.randint(0, len(denial_reasons) - 1)
+        payer = rng.choice(payers)
+        department = rng.choice(departments)
+        reason_idx = rng.randint(0, len(denial_reasons) - 1)
         denial_reason = denial_reasons[reason_idx]
         rejection_code = rejection_codes[reason_idx]
         
@@ -158,20 +196,19 @@ def generate_denial_data():
     
     return pd.DataFrame(denial_data)
 
-@st.cache_data
-def generate_monthly_clean_claim_data():
+def generate_monthly_clean_claim_data(seed=42):
     # Generate 12 months of clean claim rate data
     months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
     
     # Simulate clean claim rates (percentage of claims that pass without issues)
-    np.random.seed(42)
+    rng = random.Random(seed)
     base_rate = 85  # Base clean claim rate
     rates = []
     
     for i in range(12):
         # Add some variation and slight upward trend
-        variation = random.uniform(-5, 8)
+        variation = rng.uniform(-5, 8)
         trend = i * 0.5  # Slight improvement over time
         rate = min(95, max(75, base_rate + variation + trend))
         rates.append(round(rate, 1))
@@ -181,25 +218,23 @@ def generate_monthly_clean_claim_data():
         'Clean Claim Rate': rates
     })
 
-@st.cache_data
-def generate_payer_insights_data():
-    np.random.seed(42)
-    random.seed(42)
+def generate_payer_insights_data(seed=42):
+    rng = random.Random(seed)
     
     payers = ['Medicare', 'Medicaid', 'Blue Cross', 'Aetna', 'UnitedHealth', 'Humana', 'Cigna']
     
     payer_data = []
     for payer in payers:
         # Generate payer-specific metrics
-        total_claims_raised = random.uniform(800000, 2500000)
-        collection_rate = random.uniform(0.75, 0.95)
+        total_claims_raised = rng.uniform(800000, 2500000)
+        collection_rate = rng.uniform(0.75, 0.95)
         claims_received = total_claims_raised * collection_rate
         
         # Clean claim rate (percentage of claims that don't get denied initially)
-        clean_claim_rate = random.uniform(75, 95)
+        clean_claim_rate = rng.uniform(75, 95)
         
         # Average days for resolution
-        avg_resolution_days = random.uniform(25, 65)
+        avg_resolution_days = rng.uniform(25, 65)
         
         payer_data.append({
             'Payer': payer,
@@ -212,10 +247,8 @@ def generate_payer_insights_data():
     
     return pd.DataFrame(payer_data)
 
-@st.cache_data
-def generate_operational_efficiency_data():
-    np.random.seed(42)
-    random.seed(42)
+def generate_operational_efficiency_data(seed=42):
+    rng = random.Random(seed)
     
     # Define 4 claim status states
     status_states = [
@@ -239,16 +272,16 @@ def generate_operational_efficiency_data():
         for status in status_states:
             # Generate realistic days taken for each status transition
             if status == 'Coding':
-                days_taken = random.uniform(1, 4)    # Coding conversion time
+                days_taken = rng.uniform(1, 4)    # Coding conversion time
             elif status == 'Claim Scrubbing':
-                days_taken = random.uniform(2, 6)    # Scrubbing and validation
+                days_taken = rng.uniform(2, 6)    # Scrubbing and validation
             elif status == 'Billing':
-                days_taken = random.uniform(1, 3)    # Billing submission
+                days_taken = rng.uniform(1, 3)    # Billing submission
             else:  # Collection
-                days_taken = random.uniform(5, 20)   # Collection process
+                days_taken = rng.uniform(5, 20)   # Collection process
             
             # Add some weekly variation
-            weekly_variation = random.uniform(0.8, 1.3)
+            weekly_variation = rng.uniform(0.8, 1.3)
             days_taken *= weekly_variation
             
             operational_data.append({
@@ -259,10 +292,10 @@ def generate_operational_efficiency_data():
     
     return pd.DataFrame(operational_data)
 
-@st.cache_data
-def generate_claims_table_data():
-    np.random.seed(42)
-    random.seed(42)
+def generate_claims_table_data(seed=42):
+    rng = random.Random(seed)
+    np_rng = np.random.RandomState(seed)
+    today = pd.Timestamp.today().normalize()
     
     # Sample data for claims table
     assigned_to = ['John Smith', 'Sarah Johnson', 'Mike Chen', 'Emily Davis', 'Robert Wilson', 'Lisa Brown', 'David Lee', 'Jennifer Taylor']
@@ -287,17 +320,19 @@ def generate_claims_table_data():
         claim_id = f"CLM{3000 + i}"
         
         # Assign random values
-        assigned = random.choice(assigned_to)
-        status = random.choice(statuses)
+        assigned = rng.choice(assigned_to)
+        status = rng.choice(statuses)
         
         # Denial reason - only for certain statuses
         if status in ['Claim Scrubbing', 'Billing']:
-            denial_reason = random.choice([r for r in denial_reasons if r != 'N/A'])
+            denial_reason = rng.choice([r for r in denial_reasons if r != 'N/A'])
         else:
             denial_reason = 'N/A'
         
-        payer = random.choice(payers)
-        claim_amount = round(random.uniform(1000, 50000), 2)
+        payer = rng.choice(payers)
+        claim_amount = round(rng.uniform(1000, 50000), 2)
+        # Age comes from the submission date when the claim is read, so it keeps advancing
+        submission_date = today - timedelta(days=int(np_rng.randint(1, 120)))
         
         claims_data.append({
             'Claim ID': claim_id,
@@ -305,7 +340,8 @@ def generate_claims_table_data():
             'Status': status,
             'Denial Reason': denial_reason,
             'Payer': payer,
-            'Claim Amount Raised': claim_amount
+            'Claim Amount Raised': claim_amount,
+            'Submission Date': submission_date
         })
     
     return pd.DataFrame(claims_data)
@@ -322,37 +358,1711 @@ def categorize_resolution_days(days):
     else:
         return '120+ days'
 
-def financial_health_page():
+# Multi-tenant claim store: each facility is a tenant, health systems roll up their facilities
+HEALTH_SYSTEMS = {
+    'RapidClaims Health System': ['Main Hospital', 'Northside Clinic', 'Riverside Medical Center']
+}
+FACILITIES = [facility for facilities in HEALTH_SYSTEMS.values() for facility in facilities]
+DEFAULT_FACILITY = FACILITIES[0]
+
+# Higher priority tenants get a larger reserved share of the cache and are evicted last
+TENANT_PRIORITIES = {'Main Hospital': 2}
+TENANT_CACHE_BYTES = int(os.environ.get("RAPIDCLAIMS_TENANT_CACHE_MB", 512)) * 1024 * 1024
+
+def facility_seed(facility):
+    # The default facility keeps the original seed so its data is unchanged
+    return 42 + FACILITIES.index(facility)
+
+def view_facilities(view):
+    return HEALTH_SYSTEMS.get(view, [view])
+
+def format_view(view):
+    return f"{view} (all facilities)" if view in HEALTH_SYSTEMS else view
+
+def estimate_nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(v) for v in value)
+    if hasattr(value, '__dict__'):
+        return estimate_nbytes(vars(value))
+    return sys.getsizeof(value)
+
+class TenantCache:
+    # LRU cache partitioned by tenant with per-tenant memory accounting. Each tenant has a
+    # reserved share of the budget proportional to its priority; when the cache is full,
+    # only tenants above their reserved share are evicted, lowest priority first, so one
+    # large tenant can only push out its own entries
+    def __init__(self, budget_bytes, priorities=None):
+        self.budget_bytes = budget_bytes
+        self.priorities = priorities or {}
+        self.entries = defaultdict(OrderedDict)
+        self.usage = Counter()
+        self._lock = threading.RLock()
+        self._flights = SingleFlight()
+    
+    def priority(self, tenant):
+        return self.priorities.get(tenant, 1)
+    
+    def reserved_bytes(self, tenant):
+        total_priority = sum(self.priority(t) for t in self.entries)
+        return self.budget_bytes * self.priority(tenant) / max(total_priority, 1)
+    
+    def get(self, tenant, key):
+        with self._lock:
+            entries = self.entries.get(tenant)
+            if entries is None or key not in entries:
+                return None
+            entries.move_to_end(key)
+            return entries[key][0]
+    
+    def put(self, tenant, key, value):
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            self.discard(tenant, key)
+            self.entries[tenant][key] = (value, nbytes)
+            self.usage[tenant] += nbytes
+            self._evict(protect=(tenant, key))
+    
+    def discard(self, tenant, key):
+        with self._lock:
+            entries = self.entries.get(tenant)
+            if entries is not None and key in entries:
+                _, nbytes = entries.pop(key)
+                self.usage[tenant] -= nbytes
+    
+    def get_or_compute(self, tenant, key, compute):
+        value = self.get(tenant, key)
+        if value is None:
+            # Concurrent misses for the same entry share one computation
+            value = self._flights.run((tenant, key), lambda: self._compute_and_put(tenant, key, compute))
+        return value
+    
+    def _compute_and_put(self, tenant, key, compute):
+        value = self.get(tenant, key)
+        if value is None:
+            value = compute()
+            self.put(tenant, key, value)
+        return value
+    
+    def _evictable_keys(self, tenant, protect):
+        return [key for key in self.entries[tenant] if (tenant, key) != protect]
+    
+    def _evict(self, protect):
+        while sum(self.usage.values()) > self.budget_bytes:
+            over_reserved = [
+                tenant for tenant in self.entries
+                if self.usage[tenant] > self.reserved_bytes(tenant) and self._evictable_keys(tenant, protect)
+            ]
+            if not over_reserved:
+                break
+            victim = min(over_reserved, key=lambda t: (self.priority(t), self.reserved_bytes(t) - self.usage[t]))
+            # Oldest entry first, but never the entry that was just inserted
+            key = self._evictable_keys(victim, protect)[0]
+            _, nbytes = self.entries[victim].pop(key)
+            self.usage[victim] -= nbytes
+    
+    def usage_by_tenant(self):
+        with self._lock:
+            return {tenant: self.usage[tenant] for tenant, entries in self.entries.items() if entries}
+
+def get_tenant_cache():
+    # Each dataset version owns its tenant cache, so a refresh swaps every aggregate at once
+    return dataset_snapshot().cache
+
+def tenant_aggregate(view, key, compute, merge):
+    # Facility views compute directly; health-system views merge the cached facility results
+    cache = get_tenant_cache()
+    facilities = view_facilities(view)
+    if view not in HEALTH_SYSTEMS:
+        return cache.get_or_compute(view, key, lambda: compute(view))
+    return cache.get_or_compute(
+        view,
+        key,
+        lambda: merge([cache.get_or_compute(f, key, lambda f=f: compute(f)) for f in facilities])
+    )
+
+def concat_frames(frames):
+    return pd.concat(frames, ignore_index=True)
+
+def merge_mean_by(*columns):
+    def merge(frames):
+        combined = pd.concat(frames, ignore_index=True)
+        return combined.groupby(list(columns), sort=False, as_index=False).mean(numeric_only=True).round(1)
+    return merge
+
+def merge_payer_insights(frames):
+    combined = pd.concat(frames, ignore_index=True)
+    # Rates and resolution days are weighted by each facility's claims raised
+    weighted = combined[['Clean Claim Rate', 'Avg Resolution Days']].mul(combined['Total Claims Raised'], axis=0)
+    weighted['Payer'] = combined['Payer']
+    weighted['Total Claims Raised'] = combined['Total Claims Raised']
+    weighted['Claims Received'] = combined['Claims Received']
+    merged = weighted.groupby('Payer', sort=False, as_index=False).sum()
+    merged['Collection Rate'] = merged['Claims Received'] / merged['Total Claims Raised'] * 100
+    merged['Clean Claim Rate'] = merged['Clean Claim Rate'] / merged['Total Claims Raised']
+    merged['Avg Resolution Days'] = merged['Avg Resolution Days'] / merged['Total Claims Raised']
+    return merged[['Payer', 'Total Claims Raised', 'Claims Received', 'Collection Rate', 'Clean Claim Rate', 'Avg Resolution Days']]
+
+TENANT_DATASETS = {
+    'claims': (generate_sample_data, concat_frames),
+    'denials': (generate_denial_data, concat_frames),
+    'monthly_clean_claims': (generate_monthly_clean_claim_data, merge_mean_by('Month')),
+    'payer_insights': (generate_payer_insights_data, merge_payer_insights),
+    'operations': (generate_operational_efficiency_data, merge_mean_by('Week', 'Status')),
+    'claims_table': (generate_claims_table_data, concat_frames)
+}
+
+def load_dataset(view, name):
+    generator, merge = TENANT_DATASETS[name]
+    return tenant_aggregate(
+        view,
+        ('dataset', name),
+        lambda facility: generator(seed=facility_seed(facility)).assign(Facility=facility),
+        merge
+    )
+
+def filter_claims(df, selected_payer, selected_department):
+    if selected_payer != "All":
+        df = df[df['Payer'] == selected_payer]
+    if selected_department != "All":
+        df = df[df['Department'] == selected_department]
+    return df
+
+def claim_summary(claims_df):
+    return {
+        'resolution_counts': claims_df['Resolution Days'].apply(categorize_resolution_days).value_counts(),
+        'claims': len(claims_df),
+        'resolution_days': claims_df['Resolution Days'].sum(),
+        'total_raised': claims_df['Amount Raised'].sum(),
+        'total_received': claims_df['Amount Received'].sum(),
+        'total_outstanding': claims_df['Outstanding Amount'].sum()
+    }
+
+def merge_claim_summaries(summaries):
+    merged = {key: sum(summary[key] for summary in summaries) for key in summaries[0] if key != 'resolution_counts'}
+    merged['resolution_counts'] = (
+        pd.concat([summary['resolution_counts'] for summary in summaries])
+        .groupby(level=0).sum()
+        .sort_values(ascending=False)
+    )
+    return merged
+
+def merge_value_counts(counts):
+    return pd.concat(counts).groupby(level=0).sum().sort_values(ascending=False)
+
+def tenant_claim_summary(view, selected_payer, selected_department):
+    return tenant_aggregate(
+        view,
+        ('claim_summary', selected_payer, selected_department),
+        lambda facility: claim_summary(filter_claims(load_dataset(facility, 'claims'), selected_payer, selected_department)),
+        merge_claim_summaries
+    )
+
+def tenant_denial_counts(view, selected_payer, selected_department):
+    return tenant_aggregate(
+        view,
+        ('denial_counts', selected_payer, selected_department),
+        lambda facility: filter_claims(load_dataset(facility, 'denials'), selected_payer, selected_department)['Denial Reason'].value_counts(),
+        merge_value_counts
+    )
+
+# Query engine backend (DuckDB over Parquet)
+RESOLUTION_CATEGORY_SQL = """
+    CASE
+        WHEN "Resolution Days" <= 30 THEN '0-30 days'
+        WHEN "Resolution Days" <= 60 THEN '31-60 days'
+        WHEN "Resolution Days" <= 90 THEN '61-90 days'
+        WHEN "Resolution Days" <= 120 THEN '91-120 days'
+        ELSE '120+ days'
+    END
+"""
+
+def query_engine_enabled():
+    return duckdb is not None and bool(CLAIMS_PARQUET) and bool(DENIALS_PARQUET)
+
+def parquet_source(path):
+    return "read_parquet('{}')".format(path.replace("'", "''"))
+
+@st.cache_resource
+def get_query_connection():
+    con = duckdb.connect(database=":memory:")
+    con.execute(f"SET threads TO {QUERY_THREADS}")
+    con.execute(f"CREATE VIEW claims AS SELECT * FROM {parquet_source(CLAIMS_PARQUET)}")
+    con.execute(f"CREATE VIEW denials AS SELECT * FROM {parquet_source(DENIALS_PARQUET)}")
+    return con
+
+def run_query(sql, params=None):
+    # DuckDB connections are not thread safe, so each query gets its own cursor
+    return get_query_connection().cursor().execute(sql, params or []).df()
+
+def build_filter_clause(selected_payer, selected_department):
+    conditions = []
+    params = []
+    if selected_payer != "All":
+        conditions.append('"Payer" = ?')
+        params.append(selected_payer)
+    if selected_department != "All":
+        conditions.append('"Department" = ?')
+        params.append(selected_department)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES)
+def query_filter_options(version):
+    payers = run_query('SELECT DISTINCT "Payer" FROM claims ORDER BY 1')['Payer'].tolist()
+    departments = run_query('SELECT DISTINCT "Department" FROM claims ORDER BY 1')['Department'].tolist()
+    return payers, departments
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES)
+def query_claim_totals(version, selected_payer, selected_department):
+    where, params = build_filter_clause(selected_payer, selected_department)
+    totals = run_query(f"""
+        SELECT
+            count(*) AS claims,
+            coalesce(avg("Resolution Days"), 0) AS avg_resolution_days,
+            coalesce(sum("Amount Raised"), 0) AS total_raised,
+            coalesce(sum("Amount Received"), 0) AS total_received,
+            coalesce(sum("Amount Raised" - "Amount Received"), 0) AS total_outstanding
+        FROM claims {where}
+    """, params)
+    return totals.iloc[0].to_dict()
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES)
+def query_financial_health(version, selected_payer, selected_department):
+    where, params = build_filter_clause(selected_payer, selected_department)
+    resolution_counts = run_query(f"""
+        SELECT {RESOLUTION_CATEGORY_SQL} AS "Resolution Category", count(*) AS "Count"
+        FROM claims {where}
+        GROUP BY 1
+        ORDER BY 2 DESC
+    """, params).set_index('Resolution Category')['Count']
+    # Only a bounded slice of rows is pulled back for the Payment Tracker table
+    tracker_df = run_query(f"""
+        SELECT "Claim ID", "Payer", "Department", "Amount Raised", "Amount Received"
+        FROM claims {where}
+        LIMIT {TRACKER_ROW_LIMIT}
+    """, params)
+    return query_claim_totals(version, selected_payer, selected_department), resolution_counts, tracker_df
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES)
+def query_denial_counts(version, selected_payer, selected_department):
+    where, params = build_filter_clause(selected_payer, selected_department)
+    return run_query(f"""
+        SELECT "Denial Reason", count(*) AS "Count"
+        FROM denials {where}
+        GROUP BY 1
+        ORDER BY 2 DESC
+    """, params).set_index('Denial Reason')['Count']
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES)
+def query_denial_payer_breakdown(version, selected_reasons, selected_payer, selected_department):
+    where, params = build_filter_clause(selected_payer, selected_department)
+    where = f"{where} AND" if where else "WHERE"
+    placeholders = ", ".join("?" for _ in selected_reasons)
+    return run_query(f"""
+        SELECT "Payer", count(*) AS "Count"
+        FROM denials {where} "Denial Reason" IN ({placeholders})
+        GROUP BY 1
+        ORDER BY 2 DESC
+    """, params + list(selected_reasons))
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES)
+def query_payer_insights(version):
+    # Same shape as generate_payer_insights_data, aggregated from the claim and denial files
+    return run_query("""
+        WITH claim_stats AS (
+            SELECT
+                "Payer",
+                count(*) AS claims,
+                sum("Amount Raised") AS "Total Claims Raised",
+                sum("Amount Received") AS "Claims Received",
+                avg("Resolution Days") AS "Avg Resolution Days"
+            FROM claims
+            GROUP BY 1
+        ),
+        denial_stats AS (
+            SELECT "Payer", count(DISTINCT "Claim ID") AS denied
+            FROM denials
+            GROUP BY 1
+        )
+        SELECT
+            c."Payer",
+            c."Total Claims Raised",
+            c."Claims Received",
+            100.0 * c."Claims Received" / c."Total Claims Raised" AS "Collection Rate",
+            greatest(0.0, 100.0 * (1 - coalesce(d.denied, 0) / c.claims)) AS "Clean Claim Rate",
+            c."Avg Resolution Days"
+        FROM claim_stats c
+        LEFT JOIN denial_stats d USING ("Payer")
+        ORDER BY c."Payer"
+    """)
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES)
+def query_scorecard_inputs(version):
+    # Claims pre-aggregated per payer, day and resolution bucket for the payer scorecard
+    return run_query(f"""
+        SELECT
+            "Payer",
+            CAST("Submission Date" AS DATE) AS "Submission Date",
+            ("Resolution Days" // {RESOLUTION_BUCKET_DAYS}) * {RESOLUTION_BUCKET_DAYS} AS "Resolution Days",
+            count(*) AS "Claims",
+            sum("Amount Raised") AS "Amount Raised",
+            sum("Amount Received") AS "Amount Received",
+            count(*) FILTER (WHERE "Claim ID" IN (SELECT "Claim ID" FROM denials)) AS "Denied"
+        FROM claims
+        GROUP BY ALL
+    """)
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES)
+def query_denial_pattern_counts(version):
+    return run_query("""
+        SELECT "Payer", "Department", "Rejection Code", "Denial Reason", count(*) AS "Denials"
+        FROM denials
+        GROUP BY ALL
+    """)
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES)
+def query_projection_inputs(version, as_of):
+    # Resolution-day and payment-rate history from closed claims, plus open claims grouped by age
+    resolved_on = 'CAST("Submission Date" AS DATE) + CAST("Resolution Days" AS INTEGER)'
+    history_df = run_query(f"""
+        SELECT
+            "Payer",
+            "Department",
+            least("Resolution Days", {MAX_RESOLUTION_DAYS}) AS "Resolution Days",
+            count(*) AS "Claims",
+            sum("Amount Received" / "Amount Raised") AS "Payment Rate",
+            sum(("Amount Received" / "Amount Raised") ^ 2) AS "Payment Rate Sq"
+        FROM claims
+        WHERE {resolved_on} <= CAST(? AS DATE)
+        GROUP BY ALL
+    """, [as_of])
+    open_df = run_query(f"""
+        SELECT
+            "Payer",
+            "Department",
+            CAST(? AS DATE) - CAST("Submission Date" AS DATE) AS "Age Days",
+            count(*) AS "Claims",
+            sum("Amount Raised") AS "Amount Raised",
+            sum("Amount Raised" ^ 2) AS "Amount Raised Sq"
+        FROM claims
+        WHERE {resolved_on} > CAST(? AS DATE)
+        GROUP BY ALL
+    """, [as_of, as_of])
+    return history_df, open_df
+
+def query_search_sources():
+    # Row-level columns for the claim search index; the index itself is cached, not the rows
+    claims_df = run_query("""
+        SELECT
+            "Claim ID", "Payer", "Department", "Amount Raised", "Amount Received", "Resolution Days",
+            CAST("Submission Date" AS TIMESTAMP) AS "Submission Date"
+        FROM claims
+    """)
+    denials_df = run_query('SELECT "Claim ID", "Payer", "Department", "Denial Reason", "Rejection Code" FROM denials')
+    return claims_df.assign(Facility=DEFAULT_FACILITY), denials_df.assign(Facility=DEFAULT_FACILITY)
+
+# Payer scorecard (rolling-window statistics)
+SCORECARD_WINDOWS = [30, 60, 90]
+RESOLUTION_BUCKET_DAYS = 5
+MAX_RESOLUTION_DAYS = 365
+
+class PayerScorecard:
+    # Per-payer cumulative sums over date-sorted claims, so any trailing window is
+    # answered with two lookups per payer instead of rescanning the claims
+    def __init__(self, claims_df):
+        claims_df = claims_df.sort_values('Submission Date')
+        self.payers = np.array(sorted(claims_df['Payer'].unique()))
+        payer_idx = np.searchsorted(self.payers, claims_df['Payer'].to_numpy())
+        
+        dates = pd.to_datetime(claims_df['Submission Date']).dt.normalize()
+        self.start_date = dates.iloc[0]
+        self.end_date = dates.iloc[-1]
+        day_idx = (dates - self.start_date).dt.days.to_numpy()
+        n_payers = len(self.payers)
+        n_days = int(day_idx[-1]) + 1
+        cell_idx = payer_idx * n_days + day_idx
+        
+        def cumulative(weights):
+            daily = np.bincount(cell_idx, weights=weights, minlength=n_payers * n_days).reshape(n_payers, n_days)
+            # Leading zero column so a window is cum[:, end] - cum[:, start]
+            return np.concatenate([np.zeros((n_payers, 1)), np.cumsum(daily, axis=1)], axis=1)
+        
+        claim_weights = claims_df['Claims'].to_numpy(dtype=float) if 'Claims' in claims_df else np.ones(len(claims_df))
+        self.cum_claims = cumulative(claim_weights)
+        self.cum_raised = cumulative(claims_df['Amount Raised'].to_numpy(dtype=float))
+        self.cum_received = cumulative(claims_df['Amount Received'].to_numpy(dtype=float))
+        self.cum_denied = cumulative(claims_df['Denied'].to_numpy(dtype=float))
+        
+        # Resolution-day histogram per payer and day, also cumulated over days
+        self.n_buckets = MAX_RESOLUTION_DAYS // RESOLUTION_BUCKET_DAYS + 1
+        bucket = np.minimum(claims_df['Resolution Days'].to_numpy() // RESOLUTION_BUCKET_DAYS, self.n_buckets - 1).astype(np.int64)
+        histogram = np.bincount(
+            cell_idx * self.n_buckets + bucket,
+            weights=claim_weights,
+            minlength=n_payers * n_days * self.n_buckets
+        ).reshape(n_payers, n_days, self.n_buckets).astype(np.int32)
+        self.cum_resolution = np.zeros((n_payers, n_days + 1, self.n_buckets), dtype=np.int32)
+        np.cumsum(histogram, axis=1, out=self.cum_resolution[:, 1:, :])
+        
+        self._windows = {}
+    
+    @classmethod
+    def merged(cls, scorecards):
+        # Cumulative sums are additive: each facility's columns are shifted onto the combined
+        # date range (held flat before its first and after its last day) and summed per payer
+        merged = cls.__new__(cls)
+        merged.payers = np.array(sorted(set().union(*[scorecard.payers for scorecard in scorecards])))
+        merged.start_date = min(scorecard.start_date for scorecard in scorecards)
+        merged.end_date = max(scorecard.end_date for scorecard in scorecards)
+        merged.n_buckets = scorecards[0].n_buckets
+        n_days = (merged.end_date - merged.start_date).days + 1
+        shape = (len(merged.payers), n_days + 1)
+        merged.cum_claims = np.zeros(shape)
+        merged.cum_raised = np.zeros(shape)
+        merged.cum_received = np.zeros(shape)
+        merged.cum_denied = np.zeros(shape)
+        merged.cum_resolution = np.zeros(shape + (merged.n_buckets,), dtype=np.int32)
+        for scorecard in scorecards:
+            rows = np.searchsorted(merged.payers, scorecard.payers)
+            offset = (scorecard.start_date - merged.start_date).days
+            columns = np.clip(np.arange(n_days + 1) - offset, 0, scorecard.cum_claims.shape[1] - 1)
+            for name in ['cum_claims', 'cum_raised', 'cum_received', 'cum_denied', 'cum_resolution']:
+                getattr(merged, name)[rows] += getattr(scorecard, name)[:, columns]
+        merged._windows = {}
+        return merged
+    
+    def window(self, days, as_of=None):
+        as_of = self.end_date if as_of is None else pd.Timestamp(as_of).normalize()
+        key = (days, as_of)
+        if key not in self._windows:
+            self._windows[key] = self._compute_window(days, as_of)
+        return self._windows[key]
+    
+    def _resolution_percentile(self, histogram, q):
+        totals = histogram.sum(axis=1)
+        cumulative = np.cumsum(histogram, axis=1)
+        target = q * totals
+        bucket = np.argmax(cumulative >= target[:, None], axis=1)
+        rows = np.arange(len(histogram))
+        below = cumulative[rows, bucket] - histogram[rows, bucket]
+        in_bucket = np.maximum(histogram[rows, bucket], 1)
+        # Linear interpolation inside the bucket
+        days = (bucket + (target - below) / in_bucket) * RESOLUTION_BUCKET_DAYS
+        return np.where(totals > 0, days, np.nan)
+    
+    def _compute_window(self, days, as_of):
+        n_days = self.cum_claims.shape[1] - 1
+        end = int(np.clip((as_of - self.start_date).days + 1, 0, n_days))
+        start = max(0, end - days)
+        
+        claims = self.cum_claims[:, end] - self.cum_claims[:, start]
+        raised = self.cum_raised[:, end] - self.cum_raised[:, start]
+        received = self.cum_received[:, end] - self.cum_received[:, start]
+        denied = self.cum_denied[:, end] - self.cum_denied[:, start]
+        histogram = self.cum_resolution[:, end, :] - self.cum_resolution[:, start, :]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            denial_rate = np.where(claims > 0, denied / claims * 100, np.nan)
+            collection_rate = np.where(raised > 0, received / raised * 100, np.nan)
+        
+        scorecard = pd.DataFrame({
+            'Payer': self.payers,
+            'Claims': claims.astype(int),
+            'Collection Rate': collection_rate,
+            'Clean Claim Rate': 100 - denial_rate,
+            'Denial Rate': denial_rate,
+            'P50 Resolution Days': self._resolution_percentile(histogram, 0.5),
+            'P90 Resolution Days': self._resolution_percentile(histogram, 0.9)
+        })
+        
+        # Overall rank averages the collection, clean claim and resolution speed ranks
+        rank_score = (
+            scorecard['Collection Rate'].rank(ascending=False)
+            + scorecard['Clean Claim Rate'].rank(ascending=False)
+            + scorecard['P50 Resolution Days'].rank(ascending=True)
+        )
+        scorecard['Rank'] = rank_score.rank(method='min', na_option='bottom').astype(int)
+        return scorecard.sort_values('Rank').reset_index(drop=True)
+
+def get_payer_scorecard(view):
+    if query_engine_enabled():
+        return get_tenant_cache().get_or_compute(
+            DEFAULT_FACILITY, 'payer_scorecard', lambda: PayerScorecard(query_scorecard_inputs(dataset_version()))
+        )
+    return tenant_aggregate(
+        view,
+        'payer_scorecard',
+        lambda facility: PayerScorecard(load_dataset(facility, 'claims')),
+        PayerScorecard.merged
+    )
+
+# Claims workqueue (per-assignee priority queues)
+WORKQUEUE_STATUSES = ['Coding', 'Claim Scrubbing', 'Billing', 'Collection']
+WORKQUEUE_CLOSED_STATUS = 'Paid'
+
+# Weight applied to claim amount x age for denials that put the filing deadline at risk
+DENIAL_DEADLINE_RISK = {
+    'Timely Filing Limit': 3.0,
+    'Prior Authorization Required': 2.0,
+    'Medical Necessity': 1.75,
+    'Missing Documentation': 1.5,
+    'Patient Not Eligible': 1.5,
+    'Incomplete Information': 1.25,
+    'Invalid Procedure Code': 1.25,
+    'Duplicate Claim': 1.0,
+    'N/A': 1.0
+}
+
+def workqueue_priority(amount, days_open, denial_reason):
+    return amount * days_open * DENIAL_DEADLINE_RISK.get(denial_reason, 1.0)
+
+def workqueue_day(as_of=None):
+    return pd.Timestamp.today().normalize() if as_of is None else pd.Timestamp(as_of).normalize()
+
+class ClaimsWorkqueue:
+    # Claims are NumPy columns priced once for the queue's day, and each assignee's claims are
+    # a run of one priority-sorted index, so building a queue is vectorized. Claims changed
+    # after the build move to small per-assignee heaps; stale entries are skipped lazily by a
+    # per-claim version, so updates stay O(log n). Priorities grow with age at different rates,
+    # so the refresher builds a fresh queue each day; Days Open is counted at query time
+    def __init__(self, claims_df, as_of=None):
+        self._lock = threading.Lock()
+        self.day = workqueue_day(as_of)
+        self.ids = claims_df['Claim ID'].to_numpy()
+        self._rows = pd.Index(self.ids)
+        self.assignees = claims_df['Assigned to'].to_numpy(dtype=object, copy=True)
+        self.statuses = claims_df['Status'].to_numpy(dtype=object, copy=True)
+        self.denial_reasons = claims_df['Denial Reason'].to_numpy(dtype=object, copy=True)
+        self.payers = claims_df['Payer'].to_numpy(dtype=object)
+        self.amounts = claims_df['Claim Amount Raised'].to_numpy(dtype=float)
+        self.submitted = claims_df['Submission Date'].to_numpy().astype('datetime64[D]')
+        self.closed_on = np.full(len(self.ids), np.datetime64('NaT'), dtype='datetime64[D]')
+        self.versions = np.zeros(len(self.ids), dtype=np.int64)
+        
+        days_open = (np.datetime64(self.day.date(), 'D') - self.submitted).astype(np.int64)
+        risk = pd.Series(self.denial_reasons).map(DENIAL_DEADLINE_RISK).fillna(1.0).to_numpy()
+        self.priorities = self.amounts * days_open * risk
+        assignee_codes, assignee_names = pd.factorize(self.assignees, sort=True)
+        order = np.lexsort((-self.priorities, assignee_codes))
+        bounds = np.searchsorted(assignee_codes[order], np.arange(len(assignee_names) + 1))
+        self.runs = {name: order[bounds[i]:bounds[i + 1]] for i, name in enumerate(assignee_names)}
+        self.heaps = defaultdict(list)
+        self.heap_claims = Counter()
+        self.changes = 0
+        self.backlog = Counter(pd.DataFrame({'Assigned to': self.assignees, 'Status': self.statuses}).value_counts().to_dict())
+    
+    def _is_current(self, entry):
+        return self.versions[entry[2]] == entry[1]
+    
+    def update_claim(self, claim_id, status=None, denial_reason=None, assigned_to=None, as_of=None):
+        # False when the claim is not in the queue or is already closed, e.g. by another session.
+        # as_of is the day of the change; it dates a claim closed as Paid
+        with self._lock:
+            row = self._rows.get_indexer([claim_id])[0]
+            if row < 0 or not np.isnat(self.closed_on[row]):
+                return False
+            self.backlog[(self.assignees[row], self.statuses[row])] -= 1
+            if self.versions[row] > 0:
+                self.heap_claims[self.assignees[row]] -= 1
+            self.versions[row] += 1
+            self.changes += 1
+            if status == WORKQUEUE_CLOSED_STATUS:
+                self.statuses[row] = status
+                self.closed_on[row] = np.datetime64(workqueue_day(as_of).date(), 'D')
+                return True
+            if status is not None:
+                self.statuses[row] = status
+            if denial_reason is not None:
+                self.denial_reasons[row] = denial_reason
+            if assigned_to is not None:
+                self.assignees[row] = assigned_to
+            
+            assignee = self.assignees[row]
+            days_open = (np.datetime64(self.day.date(), 'D') - self.submitted[row]).astype(np.int64)
+            self.priorities[row] = workqueue_priority(self.amounts[row], days_open, self.denial_reasons[row])
+            self.backlog[(assignee, self.statuses[row])] += 1
+            self.heap_claims[assignee] += 1
+            heap = self.heaps[assignee]
+            heapq.heappush(heap, (-self.priorities[row], self.versions[row], row))
+            # Rebuild once stale entries dominate so the heap stays proportional to the changed claims
+            if len(heap) > 2 * self.heap_claims[assignee] + 64:
+                self.heaps[assignee] = [entry for entry in heap if self._is_current(entry)]
+                heapq.heapify(self.heaps[assignee])
+            return True
+    
+    def _frame(self, rows, as_of=None):
+        today = np.datetime64(workqueue_day(as_of).date(), 'D')
+        open_until = np.where(np.isnat(self.closed_on[rows]), today, self.closed_on[rows])
+        return pd.DataFrame({
+            'Claim ID': self.ids[rows],
+            'Assigned to': self.assignees[rows],
+            'Status': self.statuses[rows],
+            'Denial Reason': self.denial_reasons[rows],
+            'Payer': self.payers[rows],
+            'Claim Amount Raised': self.amounts[rows],
+            'Submission Date': pd.to_datetime(self.submitted[rows]),
+            'Days Open': (open_until - self.submitted[rows]).astype(np.int64),
+            'Priority': self.priorities[rows]
+        })
+    
+    def assignee_names(self):
+        return sorted(set(self.runs).union(self.heaps))
+    
+    def top_n(self, assignee, n=10, as_of=None):
+        with self._lock:
+            # Unchanged claims come from the sorted run, where at most `changes` entries are stale
+            run = self.runs.get(assignee, np.empty(0, dtype=np.int64))[:n + self.changes]
+            candidates = [(-self.priorities[row], row) for row in run[self.versions[run] == 0][:n]]
+            heap = self.heaps[assignee]
+            popped = []
+            while heap and len(popped) < n:
+                entry = heapq.heappop(heap)
+                if self._is_current(entry):
+                    popped.append(entry)
+            for entry in popped:
+                heapq.heappush(heap, entry)
+            candidates += [(entry[0], entry[2]) for entry in popped]
+            rows = np.array([row for _, row in sorted(candidates)[:n]], dtype=np.int64)
+            columns = ['Claim ID', 'Status', 'Denial Reason', 'Payer', 'Claim Amount Raised', 'Days Open', 'Priority']
+            return self._frame(rows, as_of)[columns]
+    
+    def lookup(self, claim_id, as_of=None):
+        # Live state of an open or closed claim, or None if the queue never held it
+        with self._lock:
+            row = self._rows.get_indexer([claim_id])[0]
+            return self._frame(np.array([row]), as_of).iloc[0].to_dict() if row >= 0 else None
+    
+    def to_frame(self, as_of=None):
+        # Every claim in its original table order, closed claims included
+        with self._lock:
+            return self._frame(np.arange(len(self.ids)), as_of).drop(columns='Priority')
+    
+    def backlog_counts(self):
+        with self._lock:
+            counts = pd.DataFrame(
+                [(assignee, status, count) for (assignee, status), count in self.backlog.items() if count > 0],
+                columns=['Assigned to', 'Status', 'Claims']
+            )
+        backlog_df = counts.pivot_table(index='Assigned to', columns='Status', values='Claims', fill_value=0, aggfunc='sum')
+        backlog_df = backlog_df.reindex(columns=WORKQUEUE_STATUSES, fill_value=0).rename_axis(columns=None)
+        backlog_df['Total'] = backlog_df.sum(axis=1)
+        return backlog_df.sort_values('Total', ascending=False).reset_index()
+
+class WorkqueueStore:
+    # A facility's live workqueue plus every change made to it. For each new dataset version
+    # and each new day the refresher builds the next queue off the request path, replays the
+    # changes and swaps it in; requests only ever build the very first queue
+    def __init__(self, facility):
+        self.facility = facility
+        self._lock = threading.RLock()
+        self._edits = {}
+        self._sequence = 0
+        self._workqueue = None
+    
+    @staticmethod
+    def _replay(workqueue, edits):
+        for claim_id, (_, changes) in edits.items():
+            workqueue.update_claim(claim_id, **changes)
+        return workqueue
+    
+    def current(self):
+        with self._lock:
+            if self._workqueue is None:
+                self._workqueue = self._replay(ClaimsWorkqueue(load_dataset(self.facility, 'claims_table')), self._edits)
+            return self._workqueue
+    
+    def rebuild(self):
+        with self._lock:
+            edits = dict(self._edits)
+            sequence = self._sequence
+        workqueue = self._replay(ClaimsWorkqueue(load_dataset(self.facility, 'claims_table')), edits)
+        with self._lock:
+            # Changes made while the new queue was being built
+            self._replay(workqueue, {claim_id: edit for claim_id, edit in self._edits.items() if edit[0] > sequence})
+            self._workqueue = workqueue
+    
+    def update_claim(self, claim_id, **changes):
+        # False when the claim is no longer open, e.g. another session closed it first
+        with self._lock:
+            changes = {key: value for key, value in changes.items() if value is not None}
+            changes['as_of'] = workqueue_day()
+            if not self.current().update_claim(claim_id, **changes):
+                return False
+            self._sequence += 1
+            self._edits[claim_id] = (self._sequence, {**self._edits.get(claim_id, (0, {}))[1], **changes})
+            return True
+
+# Workqueues hold live status changes, so they live outside the evictable tenant cache
+@st.cache_resource
+def get_workqueue_store(facility):
+    return WorkqueueStore(facility)
+
+def get_claims_workqueue(facility):
+    return get_workqueue_store(facility).current()
+
+# Cash-flow projection from Kaplan-Meier resolution-day curves and payment-rate distributions
+PROJECTION_HORIZONS = [30, 60, 90]
+MIN_HISTORY_CLAIMS = 20
+PROJECTION_TAIL_DAYS = 30
+PROJECTION_BOOTSTRAP_SAMPLES = 200
+PROJECTION_BAND_PERCENTILES = [10, 90]
+
+def projection_inputs(claims_df, as_of):
+    # Closed claims per (payer, department, resolution day) and open claims per (payer, department, age)
+    as_of = pd.Timestamp(as_of)
+    resolved_on = claims_df['Submission Date'] + pd.to_timedelta(claims_df['Resolution Days'], unit='D')
+    closed_df = claims_df[resolved_on <= as_of]
+    open_df = claims_df[resolved_on > as_of]
+    
+    payment_rate = closed_df['Amount Received'] / closed_df['Amount Raised']
+    history_df = closed_df.assign(**{
+        'Resolution Days': closed_df['Resolution Days'].clip(upper=MAX_RESOLUTION_DAYS),
+        'Claims': 1,
+        'Payment Rate': payment_rate,
+        'Payment Rate Sq': payment_rate ** 2
+    }).groupby(['Payer', 'Department', 'Resolution Days'], as_index=False, observed=True)[['Claims', 'Payment Rate', 'Payment Rate Sq']].sum()
+    open_df = open_df.assign(**{
+        'Age Days': (as_of - open_df['Submission Date']).dt.days,
+        'Claims': 1,
+        'Amount Raised Sq': open_df['Amount Raised'] ** 2
+    }).groupby(['Payer', 'Department', 'Age Days'], as_index=False, observed=True)[['Claims', 'Amount Raised', 'Amount Raised Sq']].sum()
+    return history_df, open_df
+
+def kaplan_meier(events, censored):
+    # Discrete-day survival S(t) = P(resolution days > t), one curve per row. A claim open at
+    # age a has survived day a, so it stays at risk for every day up to a. Past the last day
+    # anyone was at risk, the hazard of the last PROJECTION_TAIL_DAYS observed days carries on
+    at_risk = np.cumsum((events + censored)[:, ::-1], axis=1)[:, ::-1]
+    # At-risk counts never grow with the day, so the observed days are a prefix of each row
+    observed = at_risk > 0
+    last_day = observed.sum(axis=1) - 1
+    hazard = np.divide(events, at_risk, out=np.zeros(events.shape), where=observed)
+    
+    tail_days = last_day[:, None] - np.arange(PROJECTION_TAIL_DAYS)
+    in_tail = tail_days >= 0
+    rows = np.arange(len(events))[:, None]
+    tail_days = np.maximum(tail_days, 0)
+    tail_events = (events[rows, tail_days] * in_tail).sum(axis=1)
+    tail_at_risk = (at_risk[rows, tail_days] * in_tail).sum(axis=1)
+    tail_hazard = np.divide(tail_events, tail_at_risk, out=np.zeros(len(events)), where=tail_at_risk > 0)
+    hazard = np.where(observed, hazard, tail_hazard[:, None])
+    return np.cumprod(1 - hazard, axis=1)
+
+class CashFlowProjection:
+    # Expected receipts per horizon for each open-claim cell (payer, department, age):
+    # P(resolves within the horizon | open at its age) x amount raised x mean payment rate.
+    # Resolution curves are Kaplan-Meier estimates with open claims censored at their age,
+    # per payer x department, backing off to payer and then to all claims when a group has
+    # fewer than MIN_HISTORY_CLAIMS closed claims. The band combines a Poisson bootstrap of
+    # the history (estimation uncertainty) with the claim-level spread of each replicate.
+    # Filters select whole pairs, so point estimates and bootstrap replicates are computed
+    # once per pair and every filter only sums the pairs it selects
+    def __init__(self, history_df, open_df, seed=0):
+        self.seed = seed
+        self.history_df = history_df
+        self.open_df = open_df
+        self.n_days = MAX_RESOLUTION_DAYS + 1
+        pairs = pd.concat([history_df[['Payer', 'Department']], open_df[['Payer', 'Department']]], ignore_index=True).astype(str)
+        pair_idx, pair_keys = pd.factorize(pd.MultiIndex.from_frame(pairs), sort=True)
+        n_pairs = len(pair_keys)
+        history_pair = pair_idx[:len(history_df)]
+        open_pair = pair_idx[len(history_df):]
+        
+        # Parent group of every payer x department pair for the backoff levels. Pairs are
+        # sorted by payer, so every parent group is a contiguous run of pairs
+        payer_idx, _ = pd.factorize(pair_keys.get_level_values(0), sort=True)
+        self.parents = [np.arange(n_pairs), payer_idx, np.zeros(n_pairs, dtype=np.int64)]
+        self._group_starts = [np.flatnonzero(np.r_[True, parent[1:] != parent[:-1]]) for parent in self.parents]
+        self.pair_payers = pair_keys.get_level_values(0).to_numpy()
+        self.pair_departments = pair_keys.get_level_values(1).to_numpy()
+        
+        history_days = np.clip(history_df['Resolution Days'].to_numpy(dtype=np.int64), 0, MAX_RESOLUTION_DAYS)
+        history_claims = history_df['Claims'].to_numpy(dtype=float)
+        self.events = self._pair_matrix(history_pair, history_days, history_claims)
+        self.rate_sums = self._pair_matrix(history_pair, history_days, history_df['Payment Rate'].to_numpy(dtype=float))
+        self.rate_sq_sums = self._pair_matrix(history_pair, history_days, history_df['Payment Rate Sq'].to_numpy(dtype=float))
+        
+        self.open_pair = open_pair
+        self.open_ages = np.clip(open_df['Age Days'].to_numpy(dtype=np.int64), 0, MAX_RESOLUTION_DAYS)
+        self.open_claims = open_df['Claims'].to_numpy(dtype=float)
+        self.open_amounts = open_df['Amount Raised'].to_numpy(dtype=float)
+        self.open_amount_sq = open_df['Amount Raised Sq'].to_numpy(dtype=float)
+        self.censored = self._pair_matrix(open_pair, self.open_ages, self.open_claims)
+        self._open_cells = open_pair * self.n_days + self.open_ages
+        self.pair_open_claims = np.bincount(open_pair, weights=self.open_claims, minlength=n_pairs)
+        self.pair_open_amounts = np.bincount(open_pair, weights=self.open_amounts, minlength=n_pairs)
+        
+        # Most specific level with enough closed claims, decided once on the observed history
+        self.levels = np.full(n_pairs, len(self.parents) - 1)
+        for level in reversed(range(len(self.parents) - 1)):
+            closed = self._level_sum(self.events.sum(axis=1), level)[self.parents[level]]
+            self.levels = np.where(closed >= MIN_HISTORY_CLAIMS, level, self.levels)
+        self.has_history = self.events.sum() > 0
+        self._estimates = {}
+        self._projections = {}
+    
+    @classmethod
+    def merged(cls, projections):
+        # Inputs are sums per cell, so roll-ups regroup the facilities' cells instead of rescanning claims
+        history_df = pd.concat([projection.history_df for projection in projections], ignore_index=True)
+        open_df = pd.concat([projection.open_df for projection in projections], ignore_index=True)
+        return cls(
+            history_df.groupby(['Payer', 'Department', 'Resolution Days'], as_index=False, observed=True)[['Claims', 'Payment Rate', 'Payment Rate Sq']].sum(),
+            open_df.groupby(['Payer', 'Department', 'Age Days'], as_index=False, observed=True)[['Claims', 'Amount Raised', 'Amount Raised Sq']].sum(),
+            projections[0].seed
+        )
+    
+    def _pair_matrix(self, pair, days, values):
+        n_pairs = len(self.parents[0])
+        return np.bincount(pair * self.n_days + days, weights=values, minlength=n_pairs * self.n_days).reshape(n_pairs, self.n_days)
+    
+    def _level_sum(self, values, level):
+        # Level 0 is the pairs themselves; parent groups are contiguous runs, so one reduceat
+        if level == 0 or len(values) == 0:
+            return values
+        return np.add.reduceat(values, self._group_starts[level], axis=0)
+    
+    def _curves(self, events, censored, rate_totals, rate_sq_totals):
+        # Survival curve and payment-rate moments per pair, taken from its backoff level. Only
+        # the groups some pair backs off to are fitted
+        survival = np.zeros(events.shape)
+        rate_mean = np.zeros(len(events))
+        rate_second_moment = np.zeros(len(events))
+        for level, parent in enumerate(self.parents):
+            uses_level = self.levels == level
+            if not uses_level.any():
+                continue
+            groups, group_of_pair = np.unique(parent[uses_level], return_inverse=True)
+            level_events = self._level_sum(events, level)[groups]
+            closed = np.maximum(level_events.sum(axis=1), 1)
+            survival[uses_level] = kaplan_meier(level_events, self._level_sum(censored, level)[groups])[group_of_pair]
+            rate_mean[uses_level] = (self._level_sum(rate_totals, level)[groups] / closed)[group_of_pair]
+            rate_second_moment[uses_level] = (self._level_sum(rate_sq_totals, level)[groups] / closed)[group_of_pair]
+        return survival, rate_mean, rate_second_moment
+    
+    def _pair_moments(self, horizons, curves, with_resolving=True):
+        # Expected receipts, claim-level variance and expected resolutions per horizon and pair
+        survival, rate_mean, rate_second_moment = curves
+        survival = survival.ravel()
+        pair = self.open_pair
+        survival_at_age = np.take(survival, self._open_cells)
+        alive = survival_at_age > 0
+        survival_at_age = np.where(alive, survival_at_age, 1)
+        cell_rate = np.take(rate_mean, pair)
+        mean_payment = self.open_amounts * cell_rate
+        cell_second_moment = np.take(rate_second_moment, pair)
+        n_pairs = len(self.parents[0])
+        expected = np.zeros((len(horizons), n_pairs))
+        variance = np.zeros((len(horizons), n_pairs))
+        resolving = np.zeros((len(horizons), n_pairs))
+        for i, horizon in enumerate(horizons):
+            horizon_cells = self._open_cells + np.minimum(horizon, MAX_RESOLUTION_DAYS - self.open_ages)
+            p = np.where(alive, 1 - np.take(survival, horizon_cells) / survival_at_age, 0.0)
+            expected[i] = np.bincount(pair, weights=p * mean_payment, minlength=n_pairs)
+            # Each claim pays amount x rate with probability p: sum of p*E[X^2] - (p*E[X])^2 per claim
+            variance[i] = np.bincount(
+                pair, weights=self.open_amount_sq * (p * cell_second_moment - (p * cell_rate) ** 2), minlength=n_pairs
+            )
+            if with_resolving:
+                resolving[i] = np.bincount(pair, weights=p * self.open_claims, minlength=n_pairs)
+        return expected, variance, resolving
+    
+    def _pair_estimates(self, horizons):
+        # Computed once per horizon set and shared by every filter
+        horizons = tuple(horizons)
+        if horizons not in self._estimates:
+            self._estimates[horizons] = self._estimate(horizons)
+        return self._estimates[horizons]
+    
+    def _estimate(self, horizons):
+        rate_totals = self.rate_sums.sum(axis=1)
+        rate_sq_totals = self.rate_sq_sums.sum(axis=1)
+        expected, _, resolving = self._pair_moments(
+            horizons, self._curves(self.events, self.censored, rate_totals, rate_sq_totals)
+        )
+        
+        # Each replicate resamples every history and open-claim cell count and refits the
+        # curves; the claim-level spread is drawn once per replicate and horizon
+        rng = np.random.default_rng(self.seed)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate_per_claim = np.nan_to_num(self.rate_sums / self.events)
+            rate_sq_per_claim = np.nan_to_num(self.rate_sq_sums / self.events)
+        event_cells = np.flatnonzero(self.events)
+        censored_cells = np.flatnonzero(self.censored)
+        event_pairs = event_cells // self.n_days
+        n_pairs = len(self.parents[0])
+        replicates = np.zeros((PROJECTION_BOOTSTRAP_SAMPLES, len(horizons), n_pairs))
+        replicate_variance = np.zeros((PROJECTION_BOOTSTRAP_SAMPLES, len(horizons), n_pairs))
+        if self.has_history:
+            # Only the non-zero cells change, so the two matrices are reused across replicates
+            events = np.zeros(self.events.shape)
+            censored = np.zeros(self.censored.shape)
+            event_means = self.events.flat[event_cells]
+            censored_means = self.censored.flat[censored_cells]
+            for b in range(PROJECTION_BOOTSTRAP_SAMPLES):
+                event_counts = rng.poisson(event_means)
+                events.flat[event_cells] = event_counts
+                censored.flat[censored_cells] = rng.poisson(censored_means)
+                curves = self._curves(
+                    events,
+                    censored,
+                    np.bincount(event_pairs, weights=event_counts * rate_per_claim.flat[event_cells], minlength=n_pairs),
+                    np.bincount(event_pairs, weights=event_counts * rate_sq_per_claim.flat[event_cells], minlength=n_pairs)
+                )
+                replicates[b], replicate_variance[b], _ = self._pair_moments(horizons, curves, with_resolving=False)
+        spread = rng.standard_normal((PROJECTION_BOOTSTRAP_SAMPLES, len(horizons)))
+        return expected, resolving, replicates, replicate_variance, spread
+    
+    def project(self, horizons=PROJECTION_HORIZONS, selected_payer="All", selected_department="All"):
+        key = (tuple(horizons), selected_payer, selected_department)
+        if key not in self._projections:
+            self._projections[key] = self._project(horizons, selected_payer, selected_department)
+        return self._projections[key]
+    
+    def _project(self, horizons, selected_payer, selected_department):
+        pairs = np.ones(len(self.parents[0]), dtype=bool)
+        if selected_payer != "All":
+            pairs &= self.pair_payers == selected_payer
+        if selected_department != "All":
+            pairs &= self.pair_departments == selected_department
+        
+        expected, resolving, replicates, replicate_variance, spread = self._pair_estimates(horizons)
+        expected = expected[:, pairs].sum(axis=1)
+        resolving = resolving[:, pairs].sum(axis=1)
+        low = np.zeros(len(horizons))
+        high = np.zeros(len(horizons))
+        # No closed claims at all leaves nothing to project from
+        if self.pair_open_claims[pairs].sum() > 0 and self.has_history:
+            variance = np.maximum(replicate_variance[:, :, pairs].sum(axis=2), 0)
+            totals = replicates[:, :, pairs].sum(axis=2) + np.sqrt(variance) * spread
+            low, high = np.percentile(totals, PROJECTION_BAND_PERCENTILES, axis=0)
+        
+        return pd.DataFrame({
+            'Horizon': [f"Next {horizon} days" for horizon in horizons],
+            'Expected Receipts': expected,
+            'Low': np.maximum(np.minimum(low, expected), 0),
+            'High': np.maximum(high, expected),
+            'Claims Expected to Resolve': resolving,
+            'Open Claims': int(self.pair_open_claims[pairs].sum()),
+            'Open Amount': self.pair_open_amounts[pairs].sum()
+        })
+
+def get_cash_flow_projection(view):
+    as_of = pd.Timestamp(dataset_snapshot().as_of).normalize()
+    if query_engine_enabled():
+        return get_tenant_cache().get_or_compute(
+            DEFAULT_FACILITY,
+            'cash_flow_projection',
+            lambda: CashFlowProjection(*query_projection_inputs(dataset_version(), as_of.date()))
+        )
+    return tenant_aggregate(
+        view,
+        'cash_flow_projection',
+        lambda facility: CashFlowProjection(*projection_inputs(load_dataset(facility, 'claims'), as_of)),
+        CashFlowProjection.merged
+    )
+
+# Denial pattern mining over (Payer, Department, Rejection Code, Denial Reason)
+DENIAL_PATTERN_DIMENSIONS = ['Payer', 'Department', 'Rejection Code', 'Denial Reason']
+PATTERN_CODE_BITS = 16
+PATTERN_CODE_MASK = (1 << PATTERN_CODE_BITS) - 1
+
+# Rejection codes map one-to-one onto denial reasons, so every pair with a code would repeat
+# the same pair with its reason: pairs are ranked on the reason and the code is shown with it
+DENIAL_PATTERN_PAIRS = list(itertools.combinations(['Payer', 'Department', 'Denial Reason'], 2))
+
+class DenialPatternIndex:
+    # Sparse 4-way count tensor: each non-empty cell is one int64 key packing the four
+    # dimension codes, with its count. Batches are merged in with one np.unique, and pair
+    # and single-dimension counts are derived from the non-empty cells only
+    def __init__(self):
+        self.labels = {dim: [] for dim in DENIAL_PATTERN_DIMENSIONS}
+        self.codes = {dim: {} for dim in DENIAL_PATTERN_DIMENSIONS}
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self._results = {}
+    
+    @staticmethod
+    def _shift(dim):
+        return PATTERN_CODE_BITS * (len(DENIAL_PATTERN_DIMENSIONS) - 1 - DENIAL_PATTERN_DIMENSIONS.index(dim))
+    
+    def _encode(self, dim, values):
+        value_codes, uniques = pd.factorize(values)
+        lookup = []
+        for label in uniques:
+            if label not in self.codes[dim]:
+                if len(self.labels[dim]) > PATTERN_CODE_MASK:
+                    raise ValueError(f"Too many distinct values for {dim}")
+                self.codes[dim][label] = len(self.labels[dim])
+                self.labels[dim].append(label)
+            lookup.append(self.codes[dim][label])
+        return np.asarray(lookup, dtype=np.int64)[value_codes]
+    
+    def decode(self, dim, keys):
+        return (keys >> self._shift(dim)) & PATTERN_CODE_MASK
+    
+    def add(self, denials_df, weight_column=None):
+        keys = np.zeros(len(denials_df), dtype=np.int64)
+        for dim in DENIAL_PATTERN_DIMENSIONS:
+            keys |= self._encode(dim, denials_df[dim]) << self._shift(dim)
+        weights = denials_df[weight_column].to_numpy(dtype=float) if weight_column else None
+        
+        all_keys = np.concatenate([self.keys, keys])
+        all_weights = np.concatenate([self.counts, weights if weights is not None else np.ones(len(keys))])
+        self.keys, inverse = np.unique(all_keys, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=all_weights).astype(np.int64)
+        self._results.clear()
+        return self
+    
+    def to_frame(self):
+        cells = {dim: np.asarray(self.labels[dim], dtype=object)[self.decode(dim, self.keys)] for dim in DENIAL_PATTERN_DIMENSIONS}
+        cells['Denials'] = self.counts
+        return pd.DataFrame(cells)
+    
+    @classmethod
+    def merged(cls, indexes):
+        index = cls()
+        for other in indexes:
+            index.add(other.to_frame(), 'Denials')
+        return index
+    
+    def values(self, dim):
+        return sorted(self.labels[dim])
+    
+    def _cells(self, selected_payer, selected_department):
+        mask = np.ones(len(self.keys), dtype=bool)
+        for dim, value in [('Payer', selected_payer), ('Department', selected_department)]:
+            if value != "All":
+                code = self.codes[dim].get(value, -1)
+                mask &= self.decode(dim, self.keys) == code
+        return self.keys[mask], self.counts[mask]
+    
+    def _single_counts(self, dim, keys, counts):
+        return np.bincount(self.decode(dim, keys), weights=counts, minlength=len(self.labels[dim]))
+    
+    def _rejection_codes(self, keys):
+        # Rejection code(s) recorded with each denial reason in the given cells
+        reason_code_pairs = np.unique((self.decode('Denial Reason', keys) << PATTERN_CODE_BITS) | self.decode('Rejection Code', keys))
+        codes = defaultdict(list)
+        for reason, code in zip(reason_code_pairs >> PATTERN_CODE_BITS, reason_code_pairs & PATTERN_CODE_MASK):
+            codes[self.labels['Denial Reason'][reason]].append(self.labels['Rejection Code'][code])
+        return {reason: ', '.join(sorted(values)) for reason, values in codes.items()}
+    
+    def top_combinations(self, selected_payer="All", selected_department="All", min_denials=5, n=20, sort_by='Lift'):
+        result_key = ('top', selected_payer, selected_department, min_denials, n, sort_by)
+        if result_key in self._results:
+            return self._results[result_key]
+        
+        keys, counts = self._cells(selected_payer, selected_department)
+        total = counts.sum()
+        fixed = {dim for dim, value in [('Payer', selected_payer), ('Department', selected_department)] if value != "All"}
+        frames = []
+        for dim_a, dim_b in DENIAL_PATTERN_PAIRS:
+            # A dimension pinned by the page filters has lift 1 with everything
+            if dim_a in fixed or dim_b in fixed or total == 0:
+                continue
+            code_a = self.decode(dim_a, keys)
+            code_b = self.decode(dim_b, keys)
+            pair_keys, inverse = np.unique((code_a << PATTERN_CODE_BITS) | code_b, return_inverse=True)
+            pair_counts = np.bincount(inverse, weights=counts)
+            pair_a = pair_keys >> PATTERN_CODE_BITS
+            pair_b = pair_keys & PATTERN_CODE_MASK
+            expected = self._single_counts(dim_a, keys, counts)[pair_a] * self._single_counts(dim_b, keys, counts)[pair_b] / total
+            frames.append(pd.DataFrame({
+                'Dimension A': dim_a,
+                'Value A': np.asarray(self.labels[dim_a], dtype=object)[pair_a],
+                'Dimension B': dim_b,
+                'Value B': np.asarray(self.labels[dim_b], dtype=object)[pair_b],
+                'Denials': pair_counts.astype(int),
+                'Share': pair_counts / total * 100,
+                'Lift': pair_counts / expected
+            }))
+        
+        columns = ['Dimension A', 'Value A', 'Dimension B', 'Value B', 'Rejection Code', 'Denials', 'Share', 'Lift']
+        top_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        top_df = top_df[top_df['Denials'] >= min_denials]
+        top_df = top_df.sort_values([sort_by, 'Denials'], ascending=False).head(n).reset_index(drop=True)
+        rejection_codes = self._rejection_codes(keys)
+        top_df['Rejection Code'] = np.where(
+            top_df['Dimension A'] == 'Denial Reason',
+            top_df['Value A'].map(rejection_codes),
+            np.where(top_df['Dimension B'] == 'Denial Reason', top_df['Value B'].map(rejection_codes), '')
+        )
+        top_df = top_df[columns]
+        self._results[result_key] = top_df
+        return top_df
+    
+    def drill(self, dim_a, value_a, dim_b, value_b, selected_payer="All", selected_department="All"):
+        # Breakdown of one (dim_a, dim_b) pair across the two remaining dimensions
+        keys, counts = self._cells(selected_payer, selected_department)
+        mask = (
+            (self.decode(dim_a, keys) == self.codes[dim_a].get(value_a, -1))
+            & (self.decode(dim_b, keys) == self.codes[dim_b].get(value_b, -1))
+        )
+        keys, counts = keys[mask], counts[mask]
+        remaining = [dim for dim in DENIAL_PATTERN_DIMENSIONS if dim not in (dim_a, dim_b)]
+        drill_df = pd.DataFrame({
+            dim: np.asarray(self.labels[dim], dtype=object)[self.decode(dim, keys)] for dim in remaining
+        })
+        drill_df['Denials'] = counts
+        drill_df = drill_df.groupby(remaining, as_index=False)['Denials'].sum()
+        drill_df['Share'] = drill_df['Denials'] / max(counts.sum(), 1) * 100
+        return drill_df.sort_values('Denials', ascending=False).reset_index(drop=True)
+
+def get_denial_patterns(view):
+    if query_engine_enabled():
+        return get_tenant_cache().get_or_compute(
+            DEFAULT_FACILITY,
+            'denial_patterns',
+            lambda: DenialPatternIndex().add(query_denial_pattern_counts(dataset_version()), 'Denials')
+        )
+    return tenant_aggregate(
+        view,
+        'denial_patterns',
+        lambda facility: DenialPatternIndex().add(load_dataset(facility, 'denials')),
+        DenialPatternIndex.merged
+    )
+
+# Claim search: Claim ID lookups plus an inverted index over the claim's text fields
+SEARCH_FIELDS = ['Payer', 'Department', 'Assigned to', 'Denial Reason']
+SEARCH_RESULT_LIMIT = 50
+CLAIM_LIFECYCLE_COLUMNS = [
+    'Facility', 'Claim ID', 'Status', 'Payer', 'Department', 'Assigned to', 'Submission Date',
+    'Amount Raised', 'Amount Received', 'Outstanding Amount', 'Resolution Days', 'Days Open',
+    'Denial Reason', 'Rejection Code'
+]
+
+def search_tokens(value):
+    return re.findall(r'[a-z0-9]+', str(value).lower())
+
+def prefix_range(sorted_values, prefix):
+    # Nothing in a fixed-width string array is longer than its width, and a longer key
+    # would make numpy widen (copy) the whole array
+    width = sorted_values.dtype.itemsize // np.dtype('U1').itemsize
+    if len(prefix) > width:
+        return 0, 0
+    lo = np.searchsorted(sorted_values, prefix, side='left')
+    if len(prefix) == width:
+        return lo, np.searchsorted(sorted_values, prefix, side='right')
+    return lo, np.searchsorted(sorted_values, prefix + '\U0010ffff', side='left')
+
+def intersect_sorted(small, large):
+    # Binary-search the shorter posting list into the longer one: O(k log n) rather than O(n)
+    if len(large) == 0:
+        return large
+    positions = np.minimum(np.searchsorted(large, small), len(large) - 1)
+    return small[large[positions] == small]
+
+def claim_lifecycles(claims_df, denials_df, as_of, table_df=None):
+    # One row per (Facility, Claim ID) joining the submitted claim, its denial and its workqueue
+    # entry. Pass the workqueue table only when it comes from the same source as the claims;
+    # otherwise equal Claim IDs would join unrelated claims
+    keys = ['Facility', 'Claim ID']
+    table_columns = keys + ['Payer', 'Assigned to', 'Status', 'Denial Reason', 'Claim Amount Raised', 'Submission Date']
+    claims = claims_df[keys + ['Payer', 'Department', 'Amount Raised', 'Amount Received', 'Resolution Days', 'Submission Date']]
+    denials = denials_df[keys + ['Payer', 'Department', 'Denial Reason', 'Rejection Code']].drop_duplicates(keys, keep='last')
+    table = table_df[table_columns] if table_df is not None else pd.DataFrame(columns=table_columns)
+    table = table.assign(**{'Denial Reason': table['Denial Reason'].where(table['Denial Reason'] != 'N/A')})
+    
+    lifecycle = claims.merge(denials, on=keys, how='outer', suffixes=('', ' (denial)'))
+    lifecycle = lifecycle.merge(table, on=keys, how='outer', suffixes=('', ' (queue)'))
+    lifecycle['Payer'] = lifecycle['Payer'].fillna(lifecycle['Payer (denial)']).fillna(lifecycle['Payer (queue)'])
+    lifecycle['Department'] = lifecycle['Department'].fillna(lifecycle['Department (denial)'])
+    lifecycle['Denial Reason'] = lifecycle['Denial Reason'].fillna(lifecycle['Denial Reason (queue)'])
+    lifecycle['Amount Raised'] = lifecycle['Amount Raised'].fillna(lifecycle['Claim Amount Raised'])
+    queued_on = pd.to_datetime(lifecycle['Submission Date (queue)'])
+    lifecycle['Days Open'] = (as_of - queued_on).dt.days
+    lifecycle['Submission Date'] = lifecycle['Submission Date'].fillna(queued_on)
+    lifecycle['Outstanding Amount'] = lifecycle['Amount Raised'] - lifecycle['Amount Received']
+    
+    # Workqueue claims keep their status; submitted claims are paid once resolved, denial-only claims are denied
+    resolved_on = lifecycle['Submission Date'] + pd.to_timedelta(lifecycle['Resolution Days'], unit='D')
+    submitted_status = pd.Series(np.where(resolved_on <= as_of, WORKQUEUE_CLOSED_STATUS, 'Awaiting Payment'), index=lifecycle.index)
+    lifecycle['Status'] = (
+        lifecycle['Status']
+        .fillna(submitted_status.where(lifecycle['Submission Date'].notna()))
+        .fillna('Denied')
+    )
+    return lifecycle[CLAIM_LIFECYCLE_COLUMNS]
+
+class ClaimSearchIndex:
+    # Rows are sorted by Claim ID, so each ID and each ID prefix is one contiguous row range:
+    # exact IDs resolve through a hash index and prefixes through binary search. Text fields
+    # get an inverted index from lowercase tokens to sorted row-number postings
+    def __init__(self, lifecycle_df):
+        # Fixed-width strings sort in C, several times faster than object columns
+        ids = lifecycle_df['Claim ID'].to_numpy().astype(str)
+        facility_codes, _ = pd.factorize(lifecycle_df['Facility'], sort=True)
+        order = np.lexsort((facility_codes, ids))
+        self._set_rows(lifecycle_df.take(order).reset_index(drop=True), ids[order])
+        
+        postings = defaultdict(list)
+        for field in SEARCH_FIELDS:
+            codes, uniques = pd.factorize(self.rows[field])
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            for code, value in enumerate(uniques):
+                for token in search_tokens(value):
+                    postings[token].append(order[bounds[code]:bounds[code + 1]])
+        self._set_postings(postings)
+    
+    def _set_rows(self, rows, ids):
+        # ids holds the fixed-width Claim ID of every (already sorted) row
+        self.rows = rows
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.empty(0, dtype=np.int64)
+        self.ids = ids[starts]
+        self.starts = np.append(starts, len(ids))
+        self.id_lookup = pd.Index(self.ids)
+        # Build the hash table now instead of on the first lookup
+        self.id_lookup.get_indexer(self.ids[:1])
+    
+    def _set_postings(self, postings):
+        posting_dtype = np.int32 if len(self.rows) < 2 ** 31 else np.int64
+        self.tokens = np.array(sorted(postings), dtype=str)
+        self.postings = [np.unique(np.concatenate(postings[token])).astype(posting_dtype) for token in self.tokens]
+    
+    @classmethod
+    def merged(cls, indexes):
+        # Roll-ups merge the facility indexes instead of rescanning their rows: each index is
+        # already sorted by Claim ID, so a stable argsort of the concatenated runs is a k-way
+        # merge (timsort finds the runs), and postings only need their row numbers remapped
+        indexes = sorted(indexes, key=lambda index: index.rows['Facility'].min() if len(index.rows) else '')
+        run_ids = [np.repeat(index.ids, np.diff(index.starts)) for index in indexes]
+        offsets = np.cumsum([0] + [len(ids) for ids in run_ids])
+        ids = np.concatenate(run_ids) if run_ids else np.empty(0, dtype=str)
+        order = np.argsort(ids, kind='stable')
+        new_rows = np.empty(len(order), dtype=np.int64)
+        new_rows[order] = np.arange(len(order))
+        
+        merged = cls.__new__(cls)
+        rows = pd.concat([index.rows for index in indexes], ignore_index=True)
+        merged._set_rows(rows.take(order).reset_index(drop=True), ids[order])
+        postings = defaultdict(list)
+        for index, offset, end in zip(indexes, offsets, offsets[1:]):
+            for token, token_rows in zip(index.tokens, index.postings):
+                postings[token].append(new_rows[offset:end][token_rows])
+        merged._set_postings(postings)
+        return merged
+    
+    def _id_rows(self, claim_id):
+        position = self.id_lookup.get_indexer([claim_id])[0]
+        if position < 0:
+            return None
+        return np.arange(self.starts[position], self.starts[position + 1])
+    
+    def _term_rows(self, term):
+        # Claim IDs are upper case; text tokens are indexed lower case
+        matches = []
+        lo, hi = prefix_range(self.ids, term.upper())
+        if hi > lo:
+            matches.append(np.arange(self.starts[lo], self.starts[hi]))
+        lo, hi = prefix_range(self.tokens, term.lower())
+        matches.extend(self.postings[lo:hi])
+        if not matches:
+            return np.empty(0, dtype=np.int64)
+        return matches[0] if len(matches) == 1 else np.unique(np.concatenate(matches))
+    
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        # Every term must match as a Claim ID prefix or a token prefix; returns (rows, total matches)
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return self.rows.iloc[:0], 0
+        if len(terms) == 1:
+            exact = self._id_rows(terms[0].upper())
+            if exact is not None:
+                return self.rows.iloc[exact], len(exact)
+        
+        matches = sorted((self._term_rows(term) for term in terms), key=len)
+        rows = matches[0]
+        for other in matches[1:]:
+            rows = intersect_sorted(rows, other)
+        return self.rows.iloc[rows[:limit]], len(rows)
+
+def get_claim_search_index(view):
+    as_of = pd.Timestamp(dataset_snapshot().as_of).normalize()
+    if query_engine_enabled():
+        return get_tenant_cache().get_or_compute(
+            DEFAULT_FACILITY,
+            'claim_search',
+            # The workqueue table is generated, so it is not joined onto the Parquet claims
+            lambda: ClaimSearchIndex(claim_lifecycles(*query_search_sources(), as_of))
+        )
+    return tenant_aggregate(
+        view,
+        'claim_search',
+        lambda facility: ClaimSearchIndex(claim_lifecycles(
+            load_dataset(facility, 'claims'),
+            load_dataset(facility, 'denials'),
+            as_of,
+            load_dataset(facility, 'claims_table')
+        )),
+        ClaimSearchIndex.merged
+    )
+
+# Chart payload helpers: keep the number of marks per figure bounded
+CHART_TOP_N = 12
+CHART_MAX_BARS = 52
+CHART_MAX_POINTS = 2000
+WEBGL_POINT_THRESHOLD = 1000
+OTHER_LABEL = 'Other'
+
+def fold_top_n(counts, n=CHART_TOP_N):
+    # Keep the n - 1 largest categories and fold the rest into a single "Other" slice
+    counts = counts.sort_values(ascending=False)
+    if len(counts) <= n:
+        return counts
+    folded = counts.iloc[:n - 1].copy()
+    folded[OTHER_LABEL] = counts.iloc[n - 1:].sum()
+    return folded
+
+def folded_categories(counts, n=CHART_TOP_N):
+    # Categories that fold_top_n merged into "Other"
+    counts = counts.sort_values(ascending=False)
+    return counts.index[n - 1:].tolist() if len(counts) > n else []
+
+def fold_payer_insights(payer_df, n=CHART_TOP_N):
+    if len(payer_df) <= n:
+        return payer_df
+    top_payers = payer_df.nlargest(n - 1, 'Total Claims Raised')['Payer']
+    folded = payer_df.assign(Payer=payer_df['Payer'].where(payer_df['Payer'].isin(top_payers), OTHER_LABEL))
+    folded = merge_payer_insights([folded])
+    return pd.concat([folded[folded['Payer'] != OTHER_LABEL], folded[folded['Payer'] == OTHER_LABEL]], ignore_index=True)
+
+def bucket_bars(df, x, y, max_bars=CHART_MAX_BARS):
+    # Average consecutive rows into at most max_bars buckets labelled by their first x value
+    if len(df) <= max_bars:
+        return df
+    bucket = np.arange(len(df)) * max_bars // len(df)
+    return df.groupby(bucket).agg({x: 'first', y: 'mean'}).round(1)
+
+def lttb_downsample(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: returns the indices of the points to keep
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(int), n)
+    selected = [0]
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start, next_end = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        a = selected[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        selected.append(start + int(np.argmax(area)))
+    selected.append(n - 1)
+    return np.unique(selected)
+
+def min_max_downsample(y, n_buckets):
+    # Keeps each bucket's minimum and maximum so spikes survive downsampling
+    y = np.asarray(y, dtype=float)
+    if 2 * n_buckets >= len(y):
+        return np.arange(len(y))
+    bounds = np.linspace(0, len(y), n_buckets + 1).astype(int)
+    keep = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        keep.extend([start + int(np.argmin(y[start:end])), start + int(np.argmax(y[start:end]))])
+    return np.unique(keep)
+
+def trend_trace(x, y, name=None, max_points=CHART_MAX_POINTS, method='lttb'):
+    # Downsampled line trace; switches to WebGL once the kept points pass the threshold
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    if method == 'minmax':
+        keep = min_max_downsample(y, max_points // 2)
+    else:
+        keep = lttb_downsample(np.arange(len(y)), y, max_points)
+    trace_type = go.Scattergl if len(keep) > WEBGL_POINT_THRESHOLD else go.Scatter
+    return trace_type(x=x[keep], y=y[keep], mode='lines', name=name)
+
+def status_days_figure(status_data):
+    if len(status_data) <= CHART_MAX_BARS:
+        fig = px.bar(
+            status_data,
+            x='Week',
+            y='Days Taken',
+            color='Days Taken',
+            color_continuous_scale=['#4ECDC4', '#FFE66D', '#FF6B6B']
+        )
+        fig.update_traces(
+            textposition='none'
+        )
+    else:
+        # Long histories are drawn as a downsampled trend instead of one bar per period
+        fig = go.Figure(trend_trace(status_data['Week'], status_data['Days Taken']))
+        fig.update_traces(line_color='#2E86AB')
+    
+    fig.update_layout(
+        title="",
+        xaxis_title="Week",
+        yaxis_title="Days",
+        showlegend=False,
+        height=350,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis_tickangle=45
+    )
+    return fig
+
+# Dataset snapshots and background refresh (stale-while-revalidate)
+DatasetSnapshot = namedtuple('DatasetSnapshot', ['version', 'as_of', 'cache'])
+
+# Each script run and the refresh thread pin the snapshot they read from
+_pinned = threading.local()
+
+def dataset_snapshot():
+    snapshot = getattr(_pinned, 'snapshot', None)
+    return snapshot if snapshot is not None else get_dataset_refresher().current
+
+def dataset_version():
+    return dataset_snapshot().version
+
+def source_signature():
+    # Parquet file paths, sizes and mtimes, so newly landed files trigger a refresh
+    if not query_engine_enabled():
+        return None
+    paths = sorted(glob.glob(CLAIMS_PARQUET) + glob.glob(DENIALS_PARQUET))
+    return tuple((path, os.path.getsize(path), os.path.getmtime(path)) for path in paths)
+
+def warm_dataset_snapshot():
+    # Precompute everything a page shows with its default filters plus each single filter
+    if query_engine_enabled():
+        version = dataset_version()
+        payer_options, department_options = query_filter_options(version)
+        filters = [("All", "All")] + [(p, "All") for p in payer_options] + [("All", d) for d in department_options]
+        # The first projection fits the per-pair bootstrap; the other filters only sum pairs
+        projection = get_cash_flow_projection(DEFAULT_FACILITY)
+        for selected_payer, selected_department in filters:
+            query_financial_health(version, selected_payer, selected_department)
+            query_denial_counts(version, selected_payer, selected_department)
+            projection.project(PROJECTION_HORIZONS, selected_payer, selected_department)
+        query_payer_insights(version)
+        get_payer_scorecard(DEFAULT_FACILITY)
+        get_denial_patterns(DEFAULT_FACILITY).top_combinations()
+        get_claim_search_index(DEFAULT_FACILITY)
+        get_workqueue_store(DEFAULT_FACILITY).rebuild()
+        return
+    
+    # Facilities first so health-system roll-ups merge the freshly cached facility results
+    for view in FACILITIES + list(HEALTH_SYSTEMS):
+        for name in TENANT_DATASETS:
+            load_dataset(view, name)
+        claims_df = load_dataset(view, 'claims')
+        filters = (
+            [("All", "All")]
+            + [(p, "All") for p in sorted(claims_df['Payer'].unique())]
+            + [("All", d) for d in sorted(claims_df['Department'].unique())]
+        )
+        projection = get_cash_flow_projection(view)
+        for selected_payer, selected_department in filters:
+            tenant_claim_summary(view, selected_payer, selected_department)
+            tenant_denial_counts(view, selected_payer, selected_department)
+            projection.project(PROJECTION_HORIZONS, selected_payer, selected_department)
+        get_payer_scorecard(view)
+        get_denial_patterns(view).top_combinations()
+        get_claim_search_index(view)
+    for facility in FACILITIES:
+        get_workqueue_store(facility).rebuild()
+
+class DatasetRefresher:
+    # Rebuilds the next dataset version in a background thread while pages keep serving
+    # the current one, then swaps it in with a single reference assignment
+    def __init__(self, interval_seconds, poll_seconds):
+        self.interval_seconds = interval_seconds
+        self.poll_seconds = poll_seconds
+        # The first version fills lazily as pages are requested
+        self.current = DatasetSnapshot(1, datetime.now(), TenantCache(TENANT_CACHE_BYTES, TENANT_PRIORITIES))
+        self.refreshing = False
+        self.last_error = None
+        self._source_signature = source_signature()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dataset-refresher", daemon=True)
+        self._thread.start()
+    
+    def request_refresh(self):
+        self._wake.set()
+    
+    def _run(self):
+        next_refresh = time.monotonic() + self.interval_seconds
+        while True:
+            requested = self._wake.wait(timeout=self.poll_seconds)
+            self._wake.clear()
+            signature = source_signature()
+            # A new day also refreshes, so ages, priorities and the as-of date move on
+            new_day = datetime.now().date() != self.current.as_of.date()
+            if requested or new_day or signature != self._source_signature or time.monotonic() >= next_refresh:
+                self._source_signature = signature
+                self.refresh()
+                next_refresh = time.monotonic() + self.interval_seconds
+    
+    def refresh(self):
+        snapshot = DatasetSnapshot(
+            self.current.version + 1,
+            datetime.now(),
+            TenantCache(TENANT_CACHE_BYTES, TENANT_PRIORITIES)
+        )
+        self.refreshing = True
+        _pinned.snapshot = snapshot
+        try:
+            warm_dataset_snapshot()
+            self.current = snapshot
+            self.last_error = None
+        except Exception as e:
+            # Keep serving the previous version and retry on the next tick
+            logger.exception("Dataset refresh failed")
+            self.last_error = e
+        finally:
+            _pinned.snapshot = None
+            self.refreshing = False
+
+@st.cache_resource
+def get_dataset_refresher():
+    return DatasetRefresher(REFRESH_INTERVAL_SECONDS, REFRESH_POLL_SECONDS)
+
+# Shared page computations with request coalescing (single flight)
+_compute_worker = threading.local()
+
+def mark_compute_worker():
+    _compute_worker.active = True
+
+class SingleFlight:
+    # Concurrent calls with the same key wait on one in-flight computation and share its
+    # result. With an executor, top-level calls run in that bounded pool; calls made from
+    # inside a pool worker run inline so nested work never queues behind a full pool
+    def __init__(self, executor=None):
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._in_flight = {}
+    
+    def run(self, key, compute):
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+        if owner:
+            if self._executor is None or getattr(_compute_worker, 'active', False):
+                self._execute(key, future, compute, dataset_snapshot())
+            else:
+                self._executor.submit(self._execute, key, future, compute, dataset_snapshot())
+        return future.result()
+    
+    def _execute(self, key, future, compute, snapshot):
+        # Run against the caller's dataset version, restoring whatever this thread had pinned
+        previous = getattr(_pinned, 'snapshot', None)
+        _pinned.snapshot = snapshot
+        try:
+            future.set_result(compute())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            _pinned.snapshot = previous
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+@st.cache_resource
+def get_page_single_flight():
+    return SingleFlight(ThreadPoolExecutor(
+        max_workers=COMPUTE_WORKERS,
+        thread_name_prefix="page-compute",
+        initializer=mark_compute_worker
+    ))
+
+def filter_options(view):
+    if query_engine_enabled():
+        return query_filter_options(dataset_version())
+    claims_df = load_dataset(view, 'claims')
+    return sorted(claims_df['Payer'].unique().tolist()), sorted(claims_df['Department'].unique().tolist())
+
+def financial_health_data(view, selected_payer, selected_department):
+    if query_engine_enabled():
+        # Aggregate in the query engine; tracker_df only holds the Payment Tracker rows
+        totals, resolution_counts, tracker_df = query_financial_health(dataset_version(), selected_payer, selected_department)
+        avg_resolution_days = totals['avg_resolution_days']
+    else:
+        tracker_df = filter_claims(load_dataset(view, 'claims'), selected_payer, selected_department)
+        
+        # Pie chart data and metrics come from the tenant's cached summary
+        totals = tenant_claim_summary(view, selected_payer, selected_department)
+        resolution_counts = totals['resolution_counts']
+        avg_resolution_days = totals['resolution_days'] / totals['claims'] if totals['claims'] > 0 else 0
+    
+    return {
+        'tracker_df': tracker_df,
+        'resolution_counts': resolution_counts,
+        'avg_resolution_days': avg_resolution_days,
+        'total_raised': totals['total_raised'],
+        'total_received': totals['total_received'],
+        'projection_df': get_cash_flow_projection(view).project(PROJECTION_HORIZONS, selected_payer, selected_department)
+    }
+
+def denial_management_data(view, selected_payer, selected_department):
+    if query_engine_enabled():
+        totals = query_claim_totals(dataset_version(), selected_payer, selected_department)
+        denial_counts = query_denial_counts(dataset_version(), selected_payer, selected_department)
+        denial_df = None
+    else:
+        totals = tenant_claim_summary(view, selected_payer, selected_department)
+        denial_counts = tenant_denial_counts(view, selected_payer, selected_department)
+        denial_df = filter_claims(load_dataset(view, 'denials'), selected_payer, selected_department)
+    
+    return {
+        'monthly_df': load_dataset(view, 'monthly_clean_claims'),
+        'denial_df': denial_df,
+        'total_claimed': totals['total_raised'],
+        'total_outstanding': totals['total_outstanding'],
+        'denial_counts': denial_counts
+    }
+
+PAGE_COMPUTATIONS = {
+    'filter_options': filter_options,
+    'financial_health': financial_health_data,
+    'denial_management': denial_management_data
+}
+
+def run_page_computation(page, *args):
+    # Keyed by (dataset version, page, filters); results are shared, so callers must not mutate them
+    return get_page_single_flight().run(
+        (dataset_version(), page) + args,
+        lambda: PAGE_COMPUTATIONS[page](*args)
+    )
+
+def financial_health_page(view):
     # Page header
     st.markdown('<h1 class="page-header">Financial Health</h1>', unsafe_allow_html=True)
     
     # Load data
-    df = generate_sample_data()
+    payer_options, department_options = run_page_computation('filter_options', view)
     
     # Filter section
     st.markdown('<div class="filter-section">', unsafe_allow_html=True)
     col1, col2, col3, col4 = st.columns([2, 2, 2, 3])
     
     with col1:
-        selected_payer = st.selectbox("Filter by Payer:", ["All"] + sorted(df['Payer'].unique().tolist()))
+        selected_payer = st.selectbox("Filter by Payer:", ["All"] + payer_options)
     
     with col2:
-        selected_department = st.selectbox("Filter by Department:", ["All"] + sorted(df['Department'].unique().tolist()))
+        selected_department = st.selectbox("Filter by Department:", ["All"] + department_options)
     
-    # Apply filters first
-    filtered_df = df.copy()
-    if selected_payer != "All":
-        filtered_df = filtered_df[filtered_df['Payer'] == selected_payer]
-    if selected_department != "All":
-        filtered_df = filtered_df[filtered_df['Department'] == selected_department]
-    
-    # Create pie chart data first
-    filtered_df['Resolution Category'] = filtered_df['Resolution Days'].apply(categorize_resolution_days)
-    resolution_counts = filtered_df['Resolution Category'].value_counts()
+    page_data = run_page_computation('financial_health', view, selected_payer, selected_department)
+    filtered_df = page_data['tracker_df']
+    resolution_counts = page_data['resolution_counts']
+    avg_days_ar = page_data['avg_resolution_days']
+    total_raised = page_data['total_raised']
+    total_received = page_data['total_received']
     
     with col4:
-        # Calculate average from the same data used in pie chart
-        avg_days_ar = filtered_df['Resolution Days'].mean() if len(filtered_df) > 0 else 0
         st.markdown(f"""
         <div class="metric-container">
             <div class="metric-value">{avg_days_ar:.1f}</div>
@@ -369,6 +2079,7 @@ def financial_health_page():
         st.subheader("Claims Resolution Timeline")
         
         # Create pie chart
+        resolution_counts = fold_top_n(resolution_counts)
         fig_pie = px.pie(
             values=resolution_counts.values,
             names=resolution_counts.index,
@@ -389,7 +2100,10 @@ def financial_health_page():
         st.subheader("Payment Tracker")
         
         # Display the payment tracker table
-        display_df = filtered_df[['Claim ID', 'Payer', 'Department', 'Amount Raised', 'Amount Received']].copy()
+        tracker_columns = ['Claim ID', 'Payer', 'Department', 'Amount Raised', 'Amount Received']
+        if view in HEALTH_SYSTEMS:
+            tracker_columns.insert(1, 'Facility')
+        display_df = filtered_df[tracker_columns].copy()
         
         # Format currency and percentage columns
         display_df['Amount Raised'] = display_df['Amount Raised'].apply(lambda x: f"${x:,.2f}")
@@ -403,54 +2117,92 @@ def financial_health_page():
             height=400,
             hide_index=True
         )
+        if query_engine_enabled() and len(display_df) >= TRACKER_ROW_LIMIT:
+            st.caption(f"Showing the first {TRACKER_ROW_LIMIT:,} matching claims")
         
         # Summary metrics
         col_metric1, col_metric2, col_metric3 = st.columns(3)
         
         with col_metric1:
-            total_raised = filtered_df['Amount Raised'].sum()
             st.metric("Total Raised", f"${total_raised:,.2f}")
         
         with col_metric2:
-            total_received = filtered_df['Amount Received'].sum()
             st.metric("Total Received", f"${total_received:,.2f}")
         
         with col_metric3:
             collection_rate = (total_received / total_raised) * 100 if total_raised > 0 else 0
             st.metric("Collection Rate", f"{collection_rate:.1f}%")
+    
+    # Forward-looking receipts for the claims that are still open
+    st.divider()
+    st.subheader("Cash Flow Projection")
+    
+    projection_df = page_data['projection_df']
+    st.caption(
+        f"Expected receipts from {projection_df['Open Claims'].iloc[0]:,} open claims "
+        f"(${projection_df['Open Amount'].iloc[0]:,.0f} raised), with 10th-90th percentile bands"
+    )
+    
+    col_chart, col_cards = st.columns([2, 1])
+    
+    with col_chart:
+        fig_projection = px.bar(
+            projection_df,
+            x='Horizon',
+            y='Expected Receipts',
+            error_y=projection_df['High'] - projection_df['Expected Receipts'],
+            error_y_minus=projection_df['Expected Receipts'] - projection_df['Low'],
+            color_discrete_sequence=['#2E86AB']
+        )
+        
+        fig_projection.update_layout(
+            title="",
+            xaxis_title="",
+            yaxis_title="Expected Receipts ($)",
+            showlegend=False,
+            height=350,
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        
+        st.plotly_chart(fig_projection, use_container_width=True)
+    
+    with col_cards:
+        for _, row in projection_df.iterrows():
+            st.metric(
+                row['Horizon'],
+                f"${row['Expected Receipts']:,.0f}",
+                delta=f"${row['Low']:,.0f} - ${row['High']:,.0f}",
+                delta_color="off"
+            )
 
-def claims_analysis_page():
+def claims_analysis_page(view):
     # Page header
     st.markdown('<h1 class="page-header">Denial Management</h1>', unsafe_allow_html=True)
     
     # Load data
-    df = generate_sample_data()
-    denial_df = generate_denial_data()
-    monthly_df = generate_monthly_clean_claim_data()
+    use_query_engine = query_engine_enabled()
+    payer_options, department_options = run_page_computation('filter_options', view)
     
     # Filter section
     st.markdown('<div class="filter-section">', unsafe_allow_html=True)
     col1, col2, col3, col4, col5 = st.columns([2, 2, 1, 2, 2])
     
     with col1:
-        selected_payer = st.selectbox("Filter by Payer:", ["All"] + sorted(df['Payer'].unique().tolist()), key="page2_payer")
+        selected_payer = st.selectbox("Filter by Payer:", ["All"] + payer_options, key="page2_payer")
     
     with col2:
-        selected_department = st.selectbox("Filter by Department:", ["All"] + sorted(df['Department'].unique().tolist()), key="page2_dept")
+        selected_department = st.selectbox("Filter by Department:", ["All"] + department_options, key="page2_dept")
     
     with col4:
         # Filter data first to calculate accurate metrics
-        filtered_df = df.copy()
-        filtered_denial_df = denial_df.copy()
-        
-        if selected_payer != "All":
-            filtered_df = filtered_df[filtered_df['Payer'] == selected_payer]
-            filtered_denial_df = filtered_denial_df[filtered_denial_df['Payer'] == selected_payer]
-        if selected_department != "All":
-            filtered_df = filtered_df[filtered_df['Department'] == selected_department]
-            filtered_denial_df = filtered_denial_df[filtered_denial_df['Department'] == selected_department]
+        page_data = run_page_computation('denial_management', view, selected_payer, selected_department)
+        monthly_df = page_data['monthly_df']
+        filtered_denial_df = page_data['denial_df']
+        total_claimed = page_data['total_claimed']
+        total_outstanding = page_data['total_outstanding']
+        denial_counts = page_data['denial_counts']
         
-        total_claimed = filtered_df['Amount Raised'].sum()
         st.markdown(f"""
         <div class="metric-container">
             <div class="metric-value">${total_claimed:,.0f}</div>
@@ -459,7 +2211,6 @@ def claims_analysis_page():
         """, unsafe_allow_html=True)
     
     with col5:
-        total_outstanding = filtered_df['Outstanding Amount'].sum()
         outstanding_percentage = (total_outstanding / total_claimed) * 100 if total_claimed > 0 else 0
         st.markdown(f"""
         <div class="metric-container">
@@ -478,7 +2229,7 @@ def claims_analysis_page():
         
         # Create bar chart for clean claim rate
         fig_bar = px.bar(
-            monthly_df,
+            bucket_bars(monthly_df, 'Month', 'Clean Claim Rate'),
             x='Month',
             y='Clean Claim Rate',
             color='Clean Claim Rate',
@@ -509,8 +2260,8 @@ def claims_analysis_page():
         st.subheader("Denial RCA (Root Cause Analysis) - Current Month")
         
         # Create pie chart for denial reasons
-        denial_counts = filtered_denial_df['Denial Reason'].value_counts()
-        
+        other_reasons = folded_categories(denial_counts)
+        denial_counts = fold_top_n(denial_counts)
         fig_pie = px.pie(
             values=denial_counts.values,
             names=denial_counts.index,
@@ -536,7 +2287,7 @@ def claims_analysis_page():
         )
         
         # Display the pie chart with click functionality
-        selected_points = st.plotly_chart(fig_pie, use_container_width=True, on_select="rerun", selection_mode="points")
+        selected_points = st.plotly_chart(fig_pie, use_container_width=True, on_select="rerun", selection_mode="points", key="denial_rca_pie")
         
         # Check if any pie chart segment was clicked and show bar chart
         if selected_points and 'selection' in selected_points and 'points' in selected_points['selection']:
@@ -547,15 +2298,23 @@ def claims_analysis_page():
                 
                 st.info(f"Showing payer breakdown for: **{selected_reason}**")
                 
-                # Filter denial data by selected reason
-                detailed_df = filtered_denial_df[filtered_denial_df['Denial Reason'] == selected_reason]
+                # The "Other" slice stands for every folded reason
+                selected_reasons = tuple(other_reasons) if selected_reason == OTHER_LABEL else (selected_reason,)
                 
                 # Create payer breakdown for the selected denial reason
-                if len(detailed_df) > 0:
+                if use_query_engine:
+                    payer_breakdown = query_denial_payer_breakdown(dataset_version(), selected_reasons, selected_payer, selected_department)
+                else:
+                    # Filter denial data by selected reason
+                    detailed_df = filtered_denial_df[filtered_denial_df['Denial Reason'].isin(selected_reasons)]
+                    
                     # Group by payer and count occurrences
                     payer_breakdown = detailed_df.groupby('Payer').size().reset_index(name='Count')
                     payer_breakdown = payer_breakdown.sort_values('Count', ascending=False)
-                    
+                
+                payer_breakdown = fold_top_n(payer_breakdown.set_index('Payer')['Count']).rename_axis('Payer').reset_index(name='Count')
+                
+                if len(payer_breakdown) > 0:
                     # Create bar chart showing payer breakdown
                     fig_payer_bar = px.bar(
                         payer_breakdown,
@@ -587,17 +2346,80 @@ def claims_analysis_page():
                     st.plotly_chart(fig_payer_bar, use_container_width=True)
                 else:
                     st.warning("No data available for the selected denial reason.")
-        
-def payer_insights_page():
+    
+    # Co-occurrence patterns across payer, department, rejection code and denial reason
+    st.divider()
+    st.subheader("Denial Pattern Explorer")
+    
+    patterns = get_denial_patterns(view)
+    col_sort, col_min, col_spacer = st.columns([2, 2, 5])
+    
+    with col_sort:
+        sort_by = st.selectbox("Rank combinations by:", ["Lift", "Denials"], key="pattern_sort")
+    
+    with col_min:
+        min_denials = st.selectbox("Minimum denials:", [3, 5, 10, 25, 100], index=1, key="pattern_min")
+    
+    top_df = patterns.top_combinations(selected_payer, selected_department, min_denials, 20, sort_by)
+    st.dataframe(
+        top_df,
+        use_container_width=True,
+        height=300,
+        hide_index=True,
+        column_config={
+            'Share': st.column_config.NumberColumn(format="%.1f%%"),
+            'Lift': st.column_config.NumberColumn(format="%.2f")
+        }
+    )
+    
+    st.write("**Drill into a pair**")
+    col_dim_a, col_value_a, col_dim_b, col_value_b = st.columns(4)
+    
+    with col_dim_a:
+        drill_dim_a = st.selectbox("First dimension:", DENIAL_PATTERN_DIMENSIONS, key="drill_dim_a")
+    
+    with col_value_a:
+        drill_value_a = st.selectbox("Value:", patterns.values(drill_dim_a), key="drill_value_a")
+    
+    with col_dim_b:
+        drill_dim_b = st.selectbox(
+            "Second dimension:",
+            [dim for dim in DENIAL_PATTERN_DIMENSIONS if dim != drill_dim_a],
+            index=2,
+            key="drill_dim_b"
+        )
+    
+    with col_value_b:
+        drill_value_b = st.selectbox("Value:", patterns.values(drill_dim_b), key="drill_value_b")
+    
+    drill_df = patterns.drill(drill_dim_a, drill_value_a, drill_dim_b, drill_value_b, selected_payer, selected_department)
+    if len(drill_df) > 0:
+        st.dataframe(
+            drill_df,
+            use_container_width=True,
+            height=250,
+            hide_index=True,
+            column_config={'Share': st.column_config.NumberColumn(format="%.1f%%")}
+        )
+    else:
+        st.info(f"No denials with {drill_dim_a} = {drill_value_a} and {drill_dim_b} = {drill_value_b}.")
+
+def payer_insights_page(view):
     # Page header
     st.markdown('<h1 class="page-header">Payer Insights</h1>', unsafe_allow_html=True)
     
     # Load payer insights data
-    payer_df = generate_payer_insights_data()
+    if query_engine_enabled():
+        payer_df = query_payer_insights(dataset_version())
+    else:
+        payer_df = load_dataset(view, 'payer_insights')
+    
+    # Charts show the largest payers with the rest folded into "Other"; the insight cards use every payer
+    chart_payer_df = fold_payer_insights(payer_df)
     
     # Prepare data for dual bar chart
     payer_comparison_data = []
-    for _, row in payer_df.iterrows():
+    for _, row in chart_payer_df.iterrows():
         payer_comparison_data.extend([
             {
                 'Payer': row['Payer'],
@@ -648,7 +2470,7 @@ def payer_insights_page():
             trace.textposition = 'none'
         else:  # Claims Received
             # Add only percentage labels on top of Claims Received bars
-            percentages = [f"{row['Collection Rate']:.1f}%" for _, row in payer_df.iterrows()]
+            percentages = [f"{row['Collection Rate']:.1f}%" for _, row in chart_payer_df.iterrows()]
             trace.texttemplate = percentages
             trace.textposition = 'outside'
     
@@ -662,7 +2484,7 @@ def payer_insights_page():
         
         # Create clean claim rate bar chart
         fig_clean_rate = px.bar(
-            payer_df,
+            chart_payer_df,
             x='Payer',
             y='Clean Claim Rate',
             color='Clean Claim Rate',
@@ -695,7 +2517,7 @@ def payer_insights_page():
         
         # Create average resolution days bar chart
         fig_resolution_days = px.bar(
-            payer_df,
+            chart_payer_df,
             x='Payer',
             y='Avg Resolution Days',
             color='Avg Resolution Days',
@@ -801,10 +2623,11 @@ def payer_insights_page():
         )
     
     with col_worst4:
-        # Calculate the payer with the biggest gap between raised and received
-        payer_df['Gap Amount'] = payer_df['Total Claims Raised'] - payer_df['Claims Received']
-        biggest_gap_payer = payer_df.loc[payer_df['Gap Amount'].idxmax(), 'Payer']
-        biggest_gap = payer_df['Gap Amount'].max()
+        # Calculate the payer with the biggest gap between raised and received. The frame is
+        # shared through the tenant cache, so the gap stays a local Series
+        gap = payer_df['Total Claims Raised'] - payer_df['Claims Received']
+        biggest_gap_payer = payer_df.loc[gap.idxmax(), 'Payer']
+        biggest_gap = gap.max()
         st.metric(
             "Largest Outstanding Gap",
             f"${biggest_gap:,.0f}",
@@ -812,29 +2635,128 @@ def payer_insights_page():
             delta_color="inverse"
         )
 
-def operational_efficiency_page():
+    # Rolling-window payer scorecard
+    st.divider()
+    st.subheader("Payer Scorecard")
+    
+    scorecard = get_payer_scorecard(view)
+    selected_window = st.selectbox(
+        "Rolling window:",
+        SCORECARD_WINDOWS,
+        format_func=lambda days: f"Last {days} days",
+        key="scorecard_window"
+    )
+    window_df = scorecard.window(selected_window)
+    st.caption(f"As of {scorecard.end_date.strftime('%m/%d/%Y')}")
+    
+    st.dataframe(
+        window_df[['Rank', 'Payer', 'Claims', 'Collection Rate', 'Clean Claim Rate', 'Denial Rate', 'P50 Resolution Days', 'P90 Resolution Days']],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Collection Rate': st.column_config.NumberColumn(format="%.1f%%"),
+            'Clean Claim Rate': st.column_config.NumberColumn(format="%.1f%%"),
+            'Denial Rate': st.column_config.NumberColumn(format="%.1f%%"),
+            'P50 Resolution Days': st.column_config.NumberColumn(format="%.0f"),
+            'P90 Resolution Days': st.column_config.NumberColumn(format="%.0f")
+        }
+    )
+
+def operational_efficiency_page(view):
     # Page header
     st.markdown('<h1 class="page-header">Operational Efficiency</h1>', unsafe_allow_html=True)
     
-    # Load claims table data
-    claims_df = generate_claims_table_data()
-    
     # Display the claims table
     st.subheader("Claims Overview")
+    view_mode = st.radio("View:", ["Table", "Workqueue"], horizontal=True, key="ops_view_mode")
     
-    # Format the table for display
-    display_df = claims_df.copy()
-    display_df['Claim Amount Raised'] = display_df['Claim Amount Raised'].apply(lambda x: f"${x:,.2f}")
-    
-    st.dataframe(
-        display_df,
-        use_container_width=True,
-        height=300,
-        hide_index=True
-    )
+    if view_mode == "Table":
+        # Built from the live workqueues so status updates show here too
+        display_df = pd.concat(
+            [get_claims_workqueue(facility).to_frame().assign(Facility=facility) for facility in view_facilities(view)],
+            ignore_index=True
+        )
+        if view not in HEALTH_SYSTEMS:
+            display_df = display_df.drop(columns='Facility')
+        display_df['Claim Amount Raised'] = display_df['Claim Amount Raised'].apply(lambda x: f"${x:,.2f}")
+        display_df['Submission Date'] = display_df['Submission Date'].dt.strftime('%m/%d/%Y')
+        
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            height=300,
+            hide_index=True
+        )
+    else:
+        if view in HEALTH_SYSTEMS:
+            workqueue_facility = st.selectbox("Facility queue:", view_facilities(view), key="wq_facility")
+        else:
+            workqueue_facility = view
+        workqueue = get_claims_workqueue(workqueue_facility)
+        col_assignee, col_top_n = st.columns([3, 1])
+        
+        with col_assignee:
+            selected_assignee = st.selectbox("Biller:", workqueue.assignee_names(), key="wq_assignee")
+        
+        with col_top_n:
+            top_n = st.selectbox("Show top:", [10, 25, 50], key="wq_top_n")
+        
+        queue_df = workqueue.top_n(selected_assignee, top_n)
+        
+        col_queue, col_backlog = st.columns([3, 2])
+        
+        with col_queue:
+            st.write(f"**Priority queue for {selected_assignee}**")
+            st.caption("Priority = claim amount × days open × denial deadline risk")
+            st.dataframe(
+                queue_df,
+                use_container_width=True,
+                height=300,
+                hide_index=True,
+                column_config={
+                    'Claim Amount Raised': st.column_config.NumberColumn(format="$%.2f"),
+                    'Priority': st.column_config.NumberColumn(format="%.0f")
+                }
+            )
+            
+            if len(queue_df) > 0:
+                claim_options = queue_df['Claim ID'].tolist()
+                # A selected claim that another session closed stays selectable until Update has
+                # reported it, instead of Update acting on whichever claim takes its place
+                settled_claims = st.session_state.setdefault("wq_settled_claims", set())
+                previous_claim = st.session_state.get("wq_claim")
+                if previous_claim is not None and previous_claim not in claim_options and previous_claim not in settled_claims:
+                    previous = workqueue.lookup(previous_claim)
+                    if previous is not None and previous['Status'] == WORKQUEUE_CLOSED_STATUS:
+                        claim_options.insert(0, previous_claim)
+                
+                col_claim, col_status, col_button = st.columns([2, 2, 1])
+                with col_claim:
+                    selected_claim = st.selectbox("Claim:", claim_options, key="wq_claim")
+                with col_status:
+                    new_status = st.selectbox("Move to:", WORKQUEUE_STATUSES + [WORKQUEUE_CLOSED_STATUS], key="wq_status")
+                with col_button:
+                    st.write("")
+                    update_clicked = st.button("Update", key="wq_update")
+                if update_clicked:
+                    updated = get_workqueue_store(workqueue_facility).update_claim(selected_claim, status=new_status)
+                    if not updated or new_status == WORKQUEUE_CLOSED_STATUS:
+                        settled_claims.add(selected_claim)
+                    if updated:
+                        st.rerun()
+                    st.warning(f"{selected_claim} is no longer open; it may have been closed in another session.")
+        
+        with col_backlog:
+            st.write("**Backlog by Assignee**")
+            st.dataframe(
+                workqueue.backlog_counts(),
+                use_container_width=True,
+                height=300,
+                hide_index=True
+            )
     
     # Load operational efficiency data for bar graphs
-    ops_df = generate_operational_efficiency_data()
+    ops_df = load_dataset(view, 'operations')
     
     # Create 4 bar graphs (2 per row, 2 rows)
     st.divider()
@@ -855,28 +2777,7 @@ def operational_efficiency_page():
             
             with col1:
                 st.write(f"**{status1}**")
-                fig1 = px.bar(
-                    status1_data,
-                    x='Week',
-                    y='Days Taken',
-                    color='Days Taken',
-                    color_continuous_scale=['#4ECDC4', '#FFE66D', '#FF6B6B']
-                )
-                
-                fig1.update_layout(
-                    title="",
-                    xaxis_title="Week",
-                    yaxis_title="Days",
-                    showlegend=False,
-                    height=350,
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    xaxis_tickangle=45
-                )
-                
-                fig1.update_traces(
-                    textposition='none'
-                )
+                fig1 = status_days_figure(status1_data)
                 
                 st.plotly_chart(fig1, use_container_width=True)
         
@@ -887,45 +2788,93 @@ def operational_efficiency_page():
             
             with col2:
                 st.write(f"**{status2}**")
-                fig2 = px.bar(
-                    status2_data,
-                    x='Week',
-                    y='Days Taken',
-                    color='Days Taken',
-                    color_continuous_scale=['#4ECDC4', '#FFE66D', '#FF6B6B']
-                )
-                
-                fig2.update_layout(
-                    title="",
-                    xaxis_title="Week",
-                    yaxis_title="Days",
-                    showlegend=False,
-                    height=350,
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    xaxis_tickangle=45
-                )
-                
-                fig2.update_traces(
-                    textposition='none'
-                )
+                fig2 = status_days_figure(status2_data)
                 
                 st.plotly_chart(fig2, use_container_width=True)
 
+def claim_search_results(view, query):
+    search_index = get_claim_search_index(view)
+    started = time.perf_counter()
+    results_df, total = search_index.search(query)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    st.subheader(f"Search results for \"{query}\"")
+    if total == 0:
+        st.info("No claims match this search.")
+        st.markdown("---")
+        return
+    shown = f" (showing first {len(results_df)})" if total > len(results_df) else ""
+    st.caption(f"{total:,} matching claims{shown} in {elapsed_ms:.1f} ms")
+    
+    # Workqueue changes happen after the index is built, so queued claims show their live state.
+    # Only rows indexed from a workqueue entry carry an assignee; Parquet claims never do
+    display_df = results_df.copy()
+    for row, facility, claim_id in zip(display_df.index, display_df['Facility'], display_df['Claim ID']):
+        if pd.isna(display_df.at[row, 'Assigned to']):
+            continue
+        claim = get_claims_workqueue(facility).lookup(claim_id)
+        if claim is None:
+            continue
+        display_df.at[row, 'Status'] = claim['Status']
+        display_df.at[row, 'Assigned to'] = claim['Assigned to']
+        display_df.at[row, 'Denial Reason'] = claim['Denial Reason'] if claim['Denial Reason'] != 'N/A' else None
+        display_df.at[row, 'Days Open'] = claim['Days Open']
+    
+    if view not in HEALTH_SYSTEMS:
+        display_df = display_df.drop(columns='Facility')
+    for column in ['Amount Raised', 'Amount Received', 'Outstanding Amount']:
+        display_df[column] = display_df[column].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "")
+    display_df['Submission Date'] = display_df['Submission Date'].dt.strftime('%m/%d/%Y')
+    
+    st.dataframe(display_df, use_container_width=True, hide_index=True)
+    st.markdown("---")
+
 # Main app
 def main():
     # Navigation
     st.sidebar.title("RapidClaims Central RCM Control Center")
     page = st.sidebar.selectbox("Select Page", ["Financial Health", "Denial Management", "Payer Insights", "Operational Efficiency"])
     
+    # Pin this run to the current dataset version; a refresh swaps in the next one later
+    refresher = get_dataset_refresher()
+    _pinned.snapshot = refresher.current
+    
+    # Facility or health-system roll-up; the query engine reads a single facility's files
+    if query_engine_enabled():
+        view = DEFAULT_FACILITY
+    else:
+        view_options = [v for system, facilities in HEALTH_SYSTEMS.items() for v in [system] + facilities]
+        view = st.sidebar.selectbox(
+            "Facility",
+            view_options,
+            index=view_options.index(DEFAULT_FACILITY),
+            format_func=format_view
+        )
+        tenant_usage = get_tenant_cache().usage_by_tenant()
+        view_usage = sum(tenant_usage.get(tenant, 0) for tenant in set([view] + view_facilities(view)))
+        st.sidebar.caption(f"Cached data for this view: {view_usage / (1024 * 1024):.2f} MB")
+    
+    st.sidebar.caption(f"Data as of {_pinned.snapshot.as_of.strftime('%m/%d/%Y %H:%M')}")
+    if refresher.refreshing:
+        st.sidebar.caption("Refreshing in the background...")
+    elif refresher.last_error is not None:
+        st.sidebar.caption("Last refresh failed; showing the previous data")
+    if st.sidebar.button("Refresh data"):
+        refresher.request_refresh()
+    
+    # Global claim search across the selected view
+    search_query = st.sidebar.text_input("Search claims", placeholder="Claim ID, payer, department, biller or denial reason")
+    if search_query.strip():
+        claim_search_results(view, search_query.strip())
+    
     if page == "Financial Health":
-        financial_health_page()
+        financial_health_page(view)
     elif page == "Denial Management":
-        claims_analysis_page()
+        claims_analysis_page(view)
     elif page == "Payer Insights":
-        payer_insights_page()
+        payer_insights_page(view)
     elif page == "Operational Efficiency":
-        operational_efficiency_page()
+        operational_efficiency_page(view)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,308 @@
+# Load test for the RapidClaims dashboard
+#
+# Starts a headless Streamlit server on app.py with the synthetic generators (no Parquet
+# files, no network beyond localhost) and drives concurrent sessions over the same
+# websocket protocol the browser uses: page navigation, facility and filter changes and
+# denial pie selections. For each session count it reports rerun latency percentiles and
+# the server's CPU and resident memory.
+#
+#   python load_test.py --sessions 1 5 10 25 --duration 30
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+PAGE_LABEL = "Select Page"
+FACILITY_LABEL = "Facility"
+FILTER_LABELS = ["Filter by Payer:", "Filter by Department:"]
+DENIAL_PAGE = "Denial Management"
+
+# Relative weights of the simulated user actions
+ACTION_WEIGHTS = {'navigate': 3, 'facility': 1, 'filter': 4, 'pie': 2}
+
+SERVER_START_TIMEOUT = 60
+RESOURCE_SAMPLE_SECONDS = 0.5
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+
+class DashboardSession:
+    def __init__(self, url, rng):
+        self.url = url
+        self.rng = rng
+        self.connection = None
+        # Widgets rendered by the latest run, by label; values are resent on every rerun
+        self.selectboxes = {}
+        self.pie = None
+        self.widget_values = {}
+        self.page = None
+        self.latencies = []
+        self.errors = 0
+
+    async def connect(self):
+        self.connection = await websocket_connect(self.url, subprotocols=["streamlit"])
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+    async def rerun(self):
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = ""
+        client_state.page_script_hash = ""
+        for widget_id, (field, value) in self.widget_values.items():
+            widget_state = client_state.widget_states.widgets.add()
+            widget_state.id = widget_id
+            setattr(widget_state, field, value)
+
+        started = time.perf_counter()
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+
+        selectboxes = {}
+        pie = None
+        while True:
+            raw = await self.connection.read_message()
+            if raw is None:
+                raise ConnectionError("server closed the session")
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "selectbox":
+                    selectboxes[element.selectbox.label] = element.selectbox
+                elif element_type == "plotly_chart" and element.plotly_chart.id:
+                    # Only charts with selection events carry a widget id
+                    spec = json.loads(element.plotly_chart.spec)
+                    traces = spec.get('data', [])
+                    if traces and traces[0].get('type') == 'pie':
+                        pie = (element.plotly_chart.id, traces[0].get('labels', []))
+                elif element_type == "exception":
+                    self.errors += 1
+            elif kind == "script_finished":
+                # An early finish means Streamlit restarted the script; wait for the real end
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors += 1
+                break
+        self.latencies.append(time.perf_counter() - started)
+
+        self.selectboxes = selectboxes
+        self.pie = pie
+        live_ids = {widget.id for widget in selectboxes.values()}
+        if pie is not None:
+            live_ids.add(pie[0])
+        self.widget_values = {k: v for k, v in self.widget_values.items() if k in live_ids}
+        if PAGE_LABEL in selectboxes:
+            page_widget = selectboxes[PAGE_LABEL]
+            selected = self.widget_values.get(page_widget.id)
+            self.page = selected[1] if selected else page_widget.options[page_widget.default]
+
+    def choose(self, label):
+        widget = self.selectboxes.get(label)
+        if widget is None or not widget.options:
+            return False
+        self.widget_values[widget.id] = ('string_value', self.rng.choice(list(widget.options)))
+        return True
+
+    def select_pie_slice(self):
+        if self.pie is None or not self.pie[1]:
+            return False
+        chart_id, labels = self.pie
+        index = self.rng.randrange(len(labels))
+        selection = {
+            'selection': {
+                'points': [{'curve_number': 0, 'point_number': index, 'point_index': index, 'label': labels[index]}],
+                'point_indices': [index],
+                'box': [],
+                'lasso': []
+            }
+        }
+        self.widget_values[chart_id] = ('string_value', json.dumps(selection))
+        return True
+
+    async def step(self):
+        actions = list(ACTION_WEIGHTS)
+        action = self.rng.choices(actions, weights=[ACTION_WEIGHTS[a] for a in actions])[0]
+        if action == 'pie' and self.page == DENIAL_PAGE:
+            acted = self.select_pie_slice()
+        elif action == 'filter':
+            acted = self.choose(self.rng.choice(FILTER_LABELS))
+        elif action == 'facility':
+            acted = self.choose(FACILITY_LABEL)
+        else:
+            acted = False
+        if not acted:
+            self.choose(PAGE_LABEL)
+        await self.rerun()
+
+
+def read_process_usage(pid):
+    # CPU seconds and resident bytes straight from /proc, so no extra dependency is needed
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    with open(f"/proc/{pid}/statm") as f:
+        rss_bytes = int(f.read().split()[1]) * PAGE_SIZE
+    return cpu_seconds, rss_bytes
+
+
+async def sample_resources(pid, samples, stop):
+    while not stop.is_set():
+        samples.append(read_process_usage(pid)[1])
+        try:
+            await asyncio.wait_for(stop.wait(), RESOURCE_SAMPLE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_phase(url, pid, sessions, duration, think_time, seed):
+    clients = [DashboardSession(url, random.Random(seed + i)) for i in range(sessions)]
+    failures = 0
+
+    async def drive(client, deadline):
+        nonlocal failures
+        try:
+            await client.connect()
+            await client.rerun()
+            while time.monotonic() < deadline:
+                await asyncio.sleep(client.rng.uniform(0, 2 * think_time))
+                await client.step()
+        except Exception:
+            failures += 1
+        finally:
+            client.close()
+
+    # Idle RSS before any session connects; per-session memory is the growth above it
+    idle_rss = read_process_usage(pid)[1] if pid else None
+    rss_samples = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_resources(pid, rss_samples, stop)) if pid else None
+    cpu_start = read_process_usage(pid)[0] if pid else None
+    started = time.monotonic()
+
+    await asyncio.gather(*(drive(client, started + duration) for client in clients))
+
+    elapsed = time.monotonic() - started
+    stop.set()
+    if sampler is not None:
+        await sampler
+
+    latencies = np.array([l for client in clients for l in client.latencies]) * 1000
+    result = {
+        'sessions': sessions,
+        'reruns': int(latencies.size),
+        'errors': sum(client.errors for client in clients) + failures,
+        'p50_ms': float(np.percentile(latencies, 50)) if latencies.size else None,
+        'p95_ms': float(np.percentile(latencies, 95)) if latencies.size else None,
+        'p99_ms': float(np.percentile(latencies, 99)) if latencies.size else None,
+        'cpu_percent': None,
+        'rss_idle_mb': None,
+        'rss_mb': None,
+        'rss_mb_per_session': None
+    }
+    if pid:
+        result['cpu_percent'] = 100 * (read_process_usage(pid)[0] - cpu_start) / elapsed
+        peak_rss = max(rss_samples + [idle_rss])
+        result['rss_idle_mb'] = idle_rss / (1024 * 1024)
+        result['rss_mb'] = peak_rss / (1024 * 1024)
+        result['rss_mb_per_session'] = (peak_rss - idle_rss) / (1024 * 1024) / sessions
+    return result
+
+
+def start_server(port):
+    # Drop the Parquet settings so the server stays on synthetic data
+    env = {k: v for k, v in os.environ.items() if not k.endswith('_PARQUET')}
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'streamlit', 'run', app_path,
+            '--server.headless', 'true',
+            '--server.port', str(port),
+            '--server.fileWatcherType', 'none',
+            '--browser.gatherUsageStats', 'false'
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Streamlit server exited during startup")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("Streamlit server did not become healthy in time")
+
+
+def format_cell(value, digits=0):
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def print_results(results):
+    header = f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6} {'cpu %':>6} {'idle MB':>7} {'rss MB':>7} {'MB/sess':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['sessions']:>8} {r['reruns']:>7} {format_cell(r['p50_ms']):>8} {format_cell(r['p95_ms']):>8} "
+            f"{format_cell(r['p99_ms']):>8} {r['errors']:>6} {format_cell(r['cpu_percent']):>6} "
+            f"{format_cell(r['rss_idle_mb'], 1):>7} {format_cell(r['rss_mb'], 1):>7} {format_cell(r['rss_mb_per_session'], 1):>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard sessions against app.py")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10, 25], help="session counts to run, one phase each")
+    parser.add_argument('--duration', type=float, default=30, help="seconds per phase")
+    parser.add_argument('--think-time', type=float, default=1.0, help="mean pause between a session's actions, in seconds")
+    parser.add_argument('--port', type=int, default=8599, help="port for the spawned server")
+    parser.add_argument('--url', help="websocket URL of an already running server instead of spawning one")
+    parser.add_argument('--pid', type=int, help="server process id to sample CPU and RSS when --url is used")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url, pid = args.url, args.pid
+    else:
+        server = start_server(args.port)
+        url, pid = f"ws://localhost:{args.port}/_stcore/stream", server.pid
+
+    results = []
+    try:
+        for sessions in args.sessions:
+            results.append(asyncio.run(run_phase(url, pid, sessions, args.duration, args.think_time, args.seed)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# Reproducible scenario generator for benchmarks and query-engine fixtures
+#
+# Claims are generated in fixed-size chunks. Every chunk draws from its own child seed
+# spawned from one SeedSequence, so the output depends only on the seed, the scenario,
+# the claim count and the chunk size - never on how many worker processes run the chunks.
+# Output is Parquet in the layout the dashboard's query engine reads.
+#
+#   python scenario_generator.py --claims 10000000 --workers 8 --output-dir /data/scenario
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+PAYERS = ['Medicare', 'Medicaid', 'Blue Cross', 'Aetna', 'UnitedHealth', 'Humana', 'Cigna']
+DEPARTMENTS = ['Cardiology', 'Orthopedics', 'Emergency', 'Surgery', 'Radiology', 'Laboratory', 'ICU']
+DENIAL_REASONS = [
+    'Missing Documentation',
+    'Prior Authorization Required',
+    'Duplicate Claim',
+    'Invalid Procedure Code',
+    'Patient Not Eligible',
+    'Incomplete Information',
+    'Medical Necessity',
+    'Timely Filing Limit',
+    'Incorrect Patient Demographics'
+]
+REJECTION_CODES = ['D001', 'D002', 'D003', 'D004', 'D005', 'D006', 'D007', 'D008', 'D009']
+
+# Changing the chunk size changes the output, so it is part of a scenario's identity
+CHUNK_SIZE = 1_000_000
+MAX_RESOLUTION_DAYS = 365
+
+DEFAULT_SCENARIO = {
+    'payer_mix': {payer: 1.0 for payer in PAYERS},
+    'denial_rate': 0.15,
+    'resolution_median_days': 45,
+    'resolution_skew': 0.8,  # log-normal sigma; higher means a longer tail of slow claims
+    'history_days': 180
+}
+
+SCENARIOS = {
+    'baseline': {},
+    'medicare_heavy': {
+        'payer_mix': {'Medicare': 5, 'Medicaid': 2, 'Blue Cross': 1, 'Aetna': 1, 'UnitedHealth': 1, 'Humana': 1, 'Cigna': 0.5}
+    },
+    'denial_spike': {'denial_rate': 0.35},
+    'slow_payers': {'resolution_median_days': 75, 'resolution_skew': 1.2}
+}
+
+def build_scenario(name='baseline', **overrides):
+    if name not in SCENARIOS:
+        raise ValueError(f"Unknown scenario: {name}")
+    scenario = dict(DEFAULT_SCENARIO, **SCENARIOS[name])
+    scenario.update({key: value for key, value in overrides.items() if value is not None})
+
+    if not scenario['payer_mix'] or min(scenario['payer_mix'].values()) < 0 or sum(scenario['payer_mix'].values()) <= 0:
+        raise ValueError("Payer mix needs at least one payer and non-negative weights")
+    if not 0 <= scenario['denial_rate'] <= 1:
+        raise ValueError("Denial rate must be between 0 and 1")
+    if scenario['resolution_median_days'] <= 0 or scenario['resolution_skew'] < 0:
+        raise ValueError("Resolution median must be positive and skew non-negative")
+    return scenario
+
+def parse_payer_mix(text):
+    # "Medicare=3,Aetna=1,Cigna" -> {'Medicare': 3.0, 'Aetna': 1.0, 'Cigna': 1.0}
+    mix = {}
+    for item in text.split(','):
+        payer, _, weight = item.partition('=')
+        if payer.strip():
+            mix[payer.strip()] = float(weight) if weight else 1.0
+    return mix
+
+def chunk_plan(n_claims, seed, chunk_size=CHUNK_SIZE):
+    # Chunk boundaries and child seeds depend only on the claim count, seed and chunk size
+    n_chunks = max(1, -(-n_claims // chunk_size))
+    children = np.random.SeedSequence(seed).spawn(n_chunks)
+    return [
+        (index, children[index], index * chunk_size, min(chunk_size, n_claims - index * chunk_size))
+        for index in range(n_chunks)
+    ]
+
+def generate_chunk(seed_sequence, first_claim, size, scenario, as_of):
+    rng = np.random.default_rng(seed_sequence)
+    payers = list(scenario['payer_mix'])
+    weights = np.array([scenario['payer_mix'][payer] for payer in payers], dtype=float)
+
+    # Draw order is fixed so a chunk is a pure function of its seed
+    payer_codes = rng.choice(len(payers), size=size, p=weights / weights.sum())
+    department_codes = rng.integers(0, len(DEPARTMENTS), size)
+    amount_raised = np.round(rng.uniform(500, 25000, size), 2)
+    amount_received = np.round(amount_raised * rng.uniform(0.7, 1.0, size), 2)
+    resolution_days = rng.lognormal(np.log(scenario['resolution_median_days']), scenario['resolution_skew'], size)
+    resolution_days = np.clip(np.rint(resolution_days), 1, MAX_RESOLUTION_DAYS).astype(np.int64)
+    age_days = rng.integers(0, scenario['history_days'], size)
+    denied = rng.random(size) < scenario['denial_rate']
+    reason_codes = rng.integers(0, len(DENIAL_REASONS), int(denied.sum()))
+
+    claim_ids = 'CLM' + pd.Series(np.arange(first_claim, first_claim + size)).astype(str)
+    payer_column = pd.Categorical.from_codes(payer_codes, categories=payers)
+    department_column = pd.Categorical.from_codes(department_codes, categories=DEPARTMENTS)
+    claims_df = pd.DataFrame({
+        'Claim ID': claim_ids,
+        'Payer': payer_column,
+        'Department': department_column,
+        'Amount Raised': amount_raised,
+        'Amount Received': amount_received,
+        'Outstanding Amount': np.round(amount_raised - amount_received, 2),
+        'Resolution Days': resolution_days,
+        'Submission Date': pd.Timestamp(as_of) - pd.to_timedelta(age_days, unit='D')
+    })
+    denials_df = pd.DataFrame({
+        'Claim ID': claim_ids[denied].to_numpy(),
+        'Payer': payer_column[denied],
+        'Department': department_column[denied],
+        'Denial Reason': pd.Categorical.from_codes(reason_codes, categories=DENIAL_REASONS),
+        'Rejection Code': pd.Categorical.from_codes(reason_codes, categories=REJECTION_CODES)
+    })
+    return claims_df, denials_df
+
+def _generate_task(task):
+    (index, seed_sequence, first_claim, size), scenario, as_of = task
+    return generate_chunk(seed_sequence, first_claim, size, scenario, as_of)
+
+def _write_task(task):
+    (index, seed_sequence, first_claim, size), scenario, as_of, output_dir = task
+    claims_df, denials_df = generate_chunk(seed_sequence, first_claim, size, scenario, as_of)
+    claims_df.to_parquet(os.path.join(output_dir, 'claims', f'part-{index:05d}.parquet'), index=False)
+    denials_df.to_parquet(os.path.join(output_dir, 'denials', f'part-{index:05d}.parquet'), index=False)
+    return len(claims_df), len(denials_df)
+
+def run_chunks(function, tasks, workers):
+    # Results come back in chunk order whatever the worker count
+    if workers <= 1:
+        return [function(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, tasks))
+
+def default_as_of():
+    return pd.Timestamp.today().normalize()
+
+def generate_scenario(n_claims, scenario=None, seed=42, workers=1, as_of=None, chunk_size=CHUNK_SIZE):
+    # In-memory claims and denials frames, for fixtures small enough to hold at once
+    scenario = scenario or build_scenario()
+    as_of = pd.Timestamp(as_of) if as_of is not None else default_as_of()
+    tasks = [(chunk, scenario, as_of) for chunk in chunk_plan(n_claims, seed, chunk_size)]
+    chunks = run_chunks(_generate_task, tasks, workers)
+    claims_df = pd.concat([claims for claims, _ in chunks], ignore_index=True)
+    denials_df = pd.concat([denials for _, denials in chunks], ignore_index=True)
+    return claims_df, denials_df
+
+def write_scenario(output_dir, n_claims, scenario=None, seed=42, workers=1, as_of=None, chunk_size=CHUNK_SIZE):
+    # One Parquet file per chunk under claims/ and denials/, plus the settings that produced them
+    scenario = scenario or build_scenario()
+    as_of = pd.Timestamp(as_of) if as_of is not None else default_as_of()
+    for table in ['claims', 'denials']:
+        os.makedirs(os.path.join(output_dir, table), exist_ok=True)
+        # Parts left over from a larger earlier run would otherwise be read as well
+        for path in glob.glob(os.path.join(output_dir, table, 'part-*.parquet')):
+            os.remove(path)
+
+    tasks = [(chunk, scenario, as_of, output_dir) for chunk in chunk_plan(n_claims, seed, chunk_size)]
+    counts = run_chunks(_write_task, tasks, workers)
+    n_denials = sum(denials for _, denials in counts)
+    with open(os.path.join(output_dir, 'scenario.json'), 'w') as f:
+        json.dump({
+            'claims': n_claims,
+            'denials': n_denials,
+            'seed': seed,
+            'chunk_size': chunk_size,
+            'as_of': as_of.strftime('%Y-%m-%d'),
+            'scenario': scenario
+        }, f, indent=2)
+    return n_claims, n_denials
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a reproducible claims scenario as Parquet")
+    parser.add_argument('--claims', type=int, default=100_000, help="number of claims to generate")
+    parser.add_argument('--output-dir', required=True, help="directory for claims/, denials/ and scenario.json")
+    parser.add_argument('--scenario', default='baseline', choices=sorted(SCENARIOS))
+    parser.add_argument('--payer-mix', type=parse_payer_mix, help='payer weights, e.g. "Medicare=3,Aetna=1,Cigna=1"')
+    parser.add_argument('--denial-rate', type=float, help="share of claims denied, 0-1")
+    parser.add_argument('--resolution-median-days', type=float, help="median days to resolution")
+    parser.add_argument('--resolution-skew', type=float, help="log-normal sigma of resolution days")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="worker processes; does not change the output")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="claims per chunk; changes the output")
+    parser.add_argument('--as-of', help="reference date (YYYY-MM-DD) for submission dates; defaults to today")
+    args = parser.parse_args()
+    if args.claims < 1 or args.chunk_size < 1:
+        parser.error("--claims and --chunk-size must be positive")
+
+    scenario = build_scenario(
+        args.scenario,
+        payer_mix=args.payer_mix,
+        denial_rate=args.denial_rate,
+        resolution_median_days=args.resolution_median_days,
+        resolution_skew=args.resolution_skew
+    )
+    started = time.perf_counter()
+    n_claims, n_denials = write_scenario(
+        args.output_dir, args.claims, scenario, args.seed, args.workers, args.as_of, args.chunk_size
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"Wrote {n_claims:,} claims and {n_denials:,} denials to {args.output_dir} in {elapsed:.1f}s")
+    print(f'export RAPIDCLAIMS_CLAIMS_PARQUET="{os.path.join(args.output_dir, "claims", "*.parquet")}"')
+    print(f'export RAPIDCLAIMS_DENIALS_PARQUET="{os.path.join(args.output_dir, "denials", "*.parquet")}"')
+
+if __name__ == "__main__":
+    main()
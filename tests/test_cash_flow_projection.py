@@ -0,0 +1,96 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+import scenario_generator
+
+AS_OF = pd.Timestamp('2026-10-19')
+
+
+def actual_receipts(claims_df, as_of, horizons):
+    # Scenario data knows every claim's resolution day, so the realised receipts are exact
+    resolved_on = claims_df['Submission Date'] + pd.to_timedelta(claims_df['Resolution Days'], unit='D')
+    still_open = resolved_on > as_of
+    return np.array([
+        claims_df.loc[still_open & (resolved_on <= as_of + pd.Timedelta(days=horizon)), 'Amount Received'].sum()
+        for horizon in horizons
+    ])
+
+
+def project(claims_df, as_of):
+    return app.CashFlowProjection(*app.projection_inputs(claims_df, as_of)).project(app.PROJECTION_HORIZONS)
+
+
+@pytest.mark.parametrize('scenario', ['baseline', 'slow_payers'])
+def test_projection_matches_known_resolution_days(scenario):
+    claims_df, _ = scenario_generator.generate_scenario(
+        100_000, scenario_generator.build_scenario(scenario), seed=1, as_of=AS_OF
+    )
+    projection = project(claims_df, AS_OF)
+    actual = actual_receipts(claims_df, AS_OF, app.PROJECTION_HORIZONS)
+
+    np.testing.assert_allclose(projection['Expected Receipts'], actual, rtol=0.05)
+    assert (projection['Low'] <= projection['Expected Receipts']).all()
+    assert (projection['Expected Receipts'] <= projection['High']).all()
+
+
+def test_band_covers_small_sample():
+    claims_df, _ = scenario_generator.generate_scenario(
+        5_000, scenario_generator.build_scenario('slow_payers'), seed=1, as_of=AS_OF
+    )
+    projection = project(claims_df, AS_OF)
+    actual = actual_receipts(claims_df, AS_OF, app.PROJECTION_HORIZONS)
+
+    assert ((projection['Low'] <= actual) & (actual <= projection['High'])).all()
+
+
+def test_open_claims_older_than_history_are_not_certain_to_pay():
+    # Claims resolve on day 100, but only 60 days of submissions exist: every closed claim
+    # took less than 60 days, so the open claims must not all be projected to pay
+    submission_days = np.arange(60)
+    claims_df = pd.DataFrame({
+        'Claim ID': [f"CLM{i}" for i in range(120)],
+        'Payer': 'Medicare',
+        'Department': 'ICU',
+        'Amount Raised': 1000.0,
+        'Amount Received': 1000.0,
+        'Resolution Days': np.r_[np.full(60, 10), np.full(60, 100)],
+        'Submission Date': AS_OF - pd.to_timedelta(np.r_[submission_days, submission_days], unit='D')
+    })
+    projection = project(claims_df, AS_OF)
+    actual = actual_receipts(claims_df, AS_OF, app.PROJECTION_HORIZONS)
+
+    assert projection['Expected Receipts'].iloc[0] < 0.75 * projection['Open Amount'].iloc[0]
+    assert projection['Expected Receipts'].iloc[0] <= actual[0] + 0.25 * projection['Open Amount'].iloc[0]
+
+
+def test_grouped_inputs_match_claim_counts():
+    claims_df, _ = scenario_generator.generate_scenario(20_000, seed=3, as_of=AS_OF)
+    history_df, open_df = app.projection_inputs(claims_df, AS_OF)
+
+    assert history_df['Claims'].sum() + open_df['Claims'].sum() == len(claims_df)
+    assert open_df['Amount Raised'].sum() == pytest.approx(
+        claims_df.loc[claims_df['Submission Date'] + pd.to_timedelta(claims_df['Resolution Days'], unit='D') > AS_OF, 'Amount Raised'].sum()
+    )
+
+
+def test_merged_projection_matches_concatenated_claims():
+    facilities = [
+        scenario_generator.generate_scenario(5_000, seed=seed, as_of=AS_OF)[0]
+        for seed in [4, 5]
+    ]
+    merged = app.CashFlowProjection.merged([app.CashFlowProjection(*app.projection_inputs(df, AS_OF)) for df in facilities])
+    combined = app.CashFlowProjection(*app.projection_inputs(pd.concat(facilities, ignore_index=True), AS_OF))
+
+    for selected_payer, selected_department in [("All", "All"), ("Medicare", "All"), ("All", "ICU")]:
+        pd.testing.assert_frame_equal(
+            merged.project(app.PROJECTION_HORIZONS, selected_payer, selected_department),
+            combined.project(app.PROJECTION_HORIZONS, selected_payer, selected_department),
+            rtol=1e-9
+        )
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+def test_merged_scorecard_matches_concatenated_claims():
+    facilities = app.HEALTH_SYSTEMS['RapidClaims Health System']
+    frames = [app.generate_sample_data(seed=app.facility_seed(facility)) for facility in facilities]
+    # Facilities with different payers and different date ranges
+    frames[0] = frames[0][frames[0]['Payer'] != 'Cigna']
+    frames[1] = frames[1][frames[1]['Submission Date'] < frames[1]['Submission Date'].max() - pd.Timedelta(days=20)]
+
+    merged = app.PayerScorecard.merged([app.PayerScorecard(df) for df in frames])
+    combined = app.PayerScorecard(pd.concat(frames, ignore_index=True))
+
+    for days in [30, 60, 90]:
+        pd.testing.assert_frame_equal(merged.window(days), combined.window(days), rtol=1e-9)
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scenario_generator
+
+AS_OF = pd.Timestamp('2026-10-19')
+
+
+def test_output_does_not_depend_on_worker_count():
+    # Small chunks so the claims span several chunks spread across the workers
+    single = scenario_generator.generate_scenario(5_000, seed=7, workers=1, as_of=AS_OF, chunk_size=1_000)
+    parallel = scenario_generator.generate_scenario(5_000, seed=7, workers=2, as_of=AS_OF, chunk_size=1_000)
+
+    for single_df, parallel_df in zip(single, parallel):
+        pd.testing.assert_frame_equal(single_df, parallel_df)
+
+
+def test_chunk_size_changes_output():
+    claims_df, _ = scenario_generator.generate_scenario(5_000, seed=7, as_of=AS_OF, chunk_size=1_000)
+    rechunked_df, _ = scenario_generator.generate_scenario(5_000, seed=7, as_of=AS_OF, chunk_size=2_500)
+
+    assert len(claims_df) == len(rechunked_df)
+    assert not claims_df.equals(rechunked_df)
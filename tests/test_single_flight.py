@@ -0,0 +1,40 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+CALLERS = 10
+
+
+@pytest.mark.parametrize('executor', [None, ThreadPoolExecutor(max_workers=2)])
+def test_concurrent_identical_requests_compute_once(executor):
+    flight = app.SingleFlight(executor)
+    calls = []
+    start = threading.Barrier(CALLERS)
+    results = [None] * CALLERS
+
+    def compute():
+        calls.append(1)
+        # Long enough for every caller to arrive while the first computation is in flight
+        time.sleep(0.3)
+        return object()
+
+    def caller(i):
+        start.wait()
+        results[i] = flight.run('page', compute)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
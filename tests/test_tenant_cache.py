@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+ENTRY_BYTES = 100
+
+
+def entry():
+    return np.zeros(ENTRY_BYTES, dtype=np.uint8)
+
+
+def test_flooding_tenant_only_evicts_its_own_entries():
+    cache = app.TenantCache(budget_bytes=20 * ENTRY_BYTES, priorities={'Main Hospital': 2})
+    for tenant in ['Main Hospital', 'Northside Clinic']:
+        for key in ['claims', 'denials']:
+            cache.put(tenant, key, entry())
+
+    for i in range(100):
+        cache.put('Riverside Medical Center', ('dataset', i), entry())
+
+    for tenant in ['Main Hospital', 'Northside Clinic']:
+        for key in ['claims', 'denials']:
+            assert cache.get(tenant, key) is not None
+    # The flooding tenant keeps its newest entries within what the others leave free
+    assert cache.get('Riverside Medical Center', ('dataset', 99)) is not None
+    assert cache.get('Riverside Medical Center', ('dataset', 0)) is None
+    assert sum(cache.usage.values()) <= cache.budget_bytes